@@ -3,14 +3,14 @@ import os
 import time
 import json
 import pickle
+import hashlib
+import threading
 import logging
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from rich.logging import RichHandler
 from rich.console import Console
-from rich.table import Table
 from rich.panel import Panel
-from rich.tree import Tree
-from rich.text import Text
 from rich.markdown import Markdown
 from rich.panel import Panel
 from rich.emoji import Emoji
@@ -22,10 +22,13 @@ from agent_as_a_judge.module.ask import DevAsk
 from agent_as_a_judge.module.locate import DevLocate
 from agent_as_a_judge.module.text_retrieve import DevTextRetrieve
 from agent_as_a_judge.module.memory import Memory
-from agent_as_a_judge.module.planning import Planning
+from agent_as_a_judge.module.planning import PlanStore
+from agent_as_a_judge.module.tag_store import TagStore
+from agent_as_a_judge.module.tag_index import TagIndex
+from agent_as_a_judge.module.workspace_summary import summarize_workspace
 from agent_as_a_judge.llm.provider import LLM
 from agent_as_a_judge.config import AgentConfig
-from agent_as_a_judge.utils import truncate_string
+from agent_as_a_judge.utils import truncate_string, EvidenceBuilder
 
 
 console = Console()
@@ -67,13 +70,16 @@ class JudgeAgent:
         )
         self.judge_workspace.mkdir(parents=True, exist_ok=True)
         self.graph_file = self.judge_workspace / "graph.pkl"
-        self.tags_file = self.judge_workspace / "tags.json"
+        self.tags_file = self.judge_workspace / TagStore.TABLE_FILE
+        self.legacy_tags_file = self.judge_workspace / "tags.json"
         self.structure_file = self.judge_workspace / "tree_structure.json"
+        self.tree_cache_file = self.judge_workspace / "workspace_tree.json"
+        self._tree_cache_lock = threading.Lock()
         print(self.structure_file)
 
         if (
             not self.graph_file.exists()
-            or not self.tags_file.exists()
+            or not (TagStore.exists(self.judge_workspace) or self.legacy_tags_file.exists())
             or not self.structure_file.exists()
         ):
             self.construct_graph()
@@ -89,7 +95,7 @@ class JudgeAgent:
         # Construct the codebase graph if not already saved
         if (
             not self.graph_file.exists()
-            or not self.tags_file.exists()
+            or not (TagStore.exists(self.judge_workspace) or self.legacy_tags_file.exists())
             or not self.structure_file.exists()
         ):
             self.construct_graph()
@@ -102,6 +108,11 @@ class JudgeAgent:
                 include_dirs=self.config.include_dirs,
                 exclude_dirs=self.config.exclude_dirs,
                 exclude_files=self.config.exclude_files,
+                cache_dir=(
+                    Path(self.config.cache_dir) / "graph"
+                    if self.config.cache_dir
+                    else None
+                ),
             )
         return self._aaaj_graph
 
@@ -109,7 +120,13 @@ class JudgeAgent:
     def aaaj_search(self):
         if not hasattr(self, "_aaaj_search"):
             self._aaaj_search = DevCodeSearch(
-                str(self.judge_workspace), self.config.setting
+                str(self.judge_workspace),
+                self.config.setting,
+                cache_dir=(
+                    Path(self.config.cache_dir) / "embeddings"
+                    if self.config.cache_dir
+                    else None
+                ),
             )
         return self._aaaj_search
 
@@ -146,9 +163,17 @@ class JudgeAgent:
     @property
     def aaaj_retrieve(self):
         if not hasattr(self, "_aaaj_retrieve"):
-            self._aaaj_retrieve = DevTextRetrieve(str(self.trajectory_file))
+            self._aaaj_retrieve = DevTextRetrieve(
+                str(self.trajectory_file), index_dir=str(self.judge_workspace)
+            )
         return self._aaaj_retrieve
 
+    @property
+    def plan_store(self):
+        if not hasattr(self, "_plan_store"):
+            self._plan_store = PlanStore(self.instance)
+        return self._plan_store
+
     @staticmethod
     def _initialize_class_vars():
 
@@ -159,64 +184,142 @@ class JudgeAgent:
 
         logging.info(f"Judging requirements for instance: {self.instance.name}")
         instance_data = self._load_instance_data()
+        requirements = instance_data.get("requirements", [])
+        user_query = instance_data.get("query", "")
+        max_workers = max(1, self.config.max_concurrency or 1)
         total_checked_requirements = 0
+        self._precompute_searches(requirements)
 
-        for i, requirement in enumerate(instance_data.get("requirements", [])):
-            user_query = instance_data.get("query", "")
-            criteria = requirement["criteria"]
-            category = requirement["category"]
-
-            if self.config.planning == "planning":
-                self.planning = Planning()
-                planning_result = self.planning.generate_plan(criteria)
-                workflow = planning_result["actions"]
-                planning_llm_stats = planning_result["llm_stats"]
-
-            elif self.config.planning == "comprehensive (no planning)":
-                workflow = [
-                    "user_query",
-                    "workspace",
-                    "locate",
-                    "read",
-                    "search",
-                    "history",
-                    "trajectory",
+        if max_workers == 1:
+            for i, requirement in enumerate(requirements):
+                self._record_judgment(
+                    instance_data, self._judge_requirement(i, requirement, user_query)
+                )
+                total_checked_requirements += 1
+        else:
+            logging.info(
+                f"Checking {len(requirements)} requirements with up to {max_workers} concurrent workers"
+            )
+            self._warm_up_modules()
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = [
+                    executor.submit(self._judge_requirement, i, requirement, user_query)
+                    for i, requirement in enumerate(requirements)
                 ]
-                planning_llm_stats = None
-
-            elif self.config.planning == "efficient (no planning)":
-                workflow = ["workspace", "locate", "read", "trajectory"]
-                planning_llm_stats = None
+                # Collect in submission order so judge_stats keeps the requirement order
+                for future in futures:
+                    self._record_judgment(instance_data, future.result())
+                    total_checked_requirements += 1
 
-            if self.config.setting == "black_box" and "trajectory" in workflow:
-                workflow.remove("trajectory")
+        if self.config.planning == "planning" and self.plan_store.dirty:
+            self.plan_store.save()
 
-            llm_stats, total_time = self.check_requirement(
-                criteria, workflow, user_query=user_query
-            )
+        logging.info(f"Total requirements checked: {total_checked_requirements}")
 
-            if planning_llm_stats:
-                llm_stats["input_tokens"] += planning_llm_stats.get("input_tokens", 0)
-                llm_stats["output_tokens"] += planning_llm_stats.get("output_tokens", 0)
-                llm_stats["cost"] += planning_llm_stats.get("cost", 0)
-                llm_stats["inference_time"] += planning_llm_stats.get(
-                    "inference_time", 0
-                )
+    def _judge_requirement(self, index: int, requirement: dict, user_query: str) -> dict:
+
+        criteria = requirement["criteria"]
+        category = requirement["category"]
+
+        if self.config.planning == "planning":
+            planning_result = getattr(self, "_generated_plans", {}).pop(
+                criteria, None
+            ) or self.plan_store.get_or_generate(criteria)
+            workflow = planning_result["actions"]
+            planning_llm_stats = planning_result["llm_stats"]
+
+        elif self.config.planning == "comprehensive (no planning)":
+            workflow = [
+                "user_query",
+                "workspace",
+                "locate",
+                "read",
+                "search",
+                "history",
+                "trajectory",
+            ]
+            planning_llm_stats = None
+
+        elif self.config.planning == "efficient (no planning)":
+            workflow = ["workspace", "locate", "read", "trajectory"]
+            planning_llm_stats = None
+
+        if self.config.setting == "black_box" and "trajectory" in workflow:
+            workflow.remove("trajectory")
+
+        llm_stats, total_time = self.check_requirement(
+            criteria, workflow, user_query=user_query
+        )
 
-            judgment_entry = {
-                "requirement_index": i,
-                "criteria": criteria,
-                "category": category,
-                "satisfied": llm_stats["satisfied"],
-                "llm_stats": llm_stats,
-                "total_time": total_time,
-            }
-            self.judge_stats.append(judgment_entry)
-            total_checked_requirements += 1
-            JudgeAgent.total_check += 1
-            self._save_judgment_data(instance_data)
+        if planning_llm_stats:
+            llm_stats["input_tokens"] += planning_llm_stats.get("input_tokens", 0)
+            llm_stats["output_tokens"] += planning_llm_stats.get("output_tokens", 0)
+            llm_stats["cost"] += planning_llm_stats.get("cost", 0)
+            llm_stats["inference_time"] += planning_llm_stats.get(
+                "inference_time", 0
+            )
+            llm_stats["cache_hits"] += planning_llm_stats.get("cache_hits", 0)
+            llm_stats["cache_misses"] += planning_llm_stats.get("cache_misses", 0)
+
+        return {
+            "requirement_index": index,
+            "criteria": criteria,
+            "category": category,
+            "satisfied": llm_stats["satisfied"],
+            "llm_stats": llm_stats,
+            "total_time": total_time,
+        }
 
-        logging.info(f"Total requirements checked: {total_checked_requirements}")
+    def _record_judgment(self, instance_data: dict, judgment_entry: dict):
+
+        self.judge_stats.append(judgment_entry)
+        JudgeAgent.total_check += 1
+        self._save_judgment_data(instance_data)
+
+    def _precompute_searches(self, requirements: list):
+        """Embed every criteria whose workflow uses the search step in one batch."""
+        if self.config.planning == "efficient (no planning)":
+            return
+
+        criteria_list = [requirement["criteria"] for requirement in requirements]
+        if self.config.planning == "planning":
+            # Plan first, so only criteria whose plan searches are embedded
+            self._generated_plans = {}
+            with ThreadPoolExecutor(
+                max_workers=max(1, self.config.max_concurrency or 1)
+            ) as executor:
+                plans = list(executor.map(self.plan_store.get_or_generate, criteria_list))
+            for criteria, planning_result in zip(criteria_list, plans):
+                if planning_result["llm_stats"] is not None:
+                    # Handed to _judge_requirement so its planning cost is still reported
+                    self._generated_plans[criteria] = planning_result
+            criteria_list = [
+                criteria
+                for criteria, planning_result in zip(criteria_list, plans)
+                if "search" in planning_result["actions"]
+            ]
+
+        if not criteria_list:
+            return
+        try:
+            self.aaaj_search.batch_hybrid_search(
+                criteria_list, top_n=self.config.search_top_n
+            )
+        except Exception as e:
+            logging.warning(f"Batched search failed, searching per requirement: {e}")
+
+    def _warm_up_modules(self):
+        """Create the lazily initialised modules before worker threads share them."""
+        self.aaaj_read
+        self.aaaj_ask
+        self.aaaj_locate
+        self.aaaj_memory
+        if self.config.planning == "planning":
+            self.plan_store
+        if self.trajectory_file and self.config.setting != "black_box":
+            self.aaaj_retrieve
+        # The tree every check_requirement puts in its evidence
+        self.display_tree(max_tokens=2000)
 
     def ask_anything(self, question: str):
 
@@ -224,9 +327,7 @@ class JudgeAgent:
         llm_stats, start_time = self.check_requirement(
             criteria=question, workflow=workflow, user_query=question
         )
-        evidence = truncate_string(
-            self.display_tree(), model=self.llm.model_name, max_tokens=10000
-        )
+        evidence = self.display_tree(max_tokens=10000)
         answer = self.aaaj_ask.ask(question, evidence=evidence)
         total_time = time.time() - start_time
         return answer
@@ -239,61 +340,90 @@ class JudgeAgent:
             "inference_time": 0.0,
             "input_tokens": 0,
             "output_tokens": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
         }
-        combined_evidence = ""
+        evidence = EvidenceBuilder(max_tokens=10000)
         related_files = []
 
-        workspace_info = truncate_string(
-            self.display_tree(), model=self.llm.model_name, max_tokens=2000
-        )
+        workspace_info = evidence.piece(self.display_tree(max_tokens=2000))
 
         for info_type in workflow:
             if info_type == "user_query" and user_query:
-                combined_evidence += (
-                    f">>> [Reference] Original User Query:\n\n{user_query}\n\n"
-                )
                 logging.info(
-                    f">>> [Reference] Original User Query:\n\n{user_query}\n\n"
+                    evidence.add(
+                        user_query,
+                        header=">>> [Reference] Original User Query:\n\n",
+                        footer="\n\n",
+                        priority=2,
+                    )
                 )
 
             elif info_type == "workspace":
-                combined_evidence += (
-                    f">>> [Key Evidence] Workspace Structure:\n\n{workspace_info}\n\n"
+                evidence.add(
+                    workspace_info,
+                    header=">>> [Key Evidence] Workspace Structure:\n\n",
+                    footer="\n\n",
+                    priority=1,
                 )
-                # logging.info(f">>> [Key Evidence] Workspace Structure:\n\n{workspace_info}\n\n")
+                # logging.info(f">>> [Key Evidence] Workspace Structure:\n\n{workspace_info.text}\n\n")
 
             elif info_type == "locate":
-                locate_result = self.locate_file(criteria, workspace_info)
+                locate_result = self.locate_file(criteria)
                 related_files = locate_result["file_paths"]
-                total_llm_stats.update(locate_result["llm_stats"])
+                self._merge_llm_stats(total_llm_stats, locate_result["llm_stats"])
+                if locate_result.get("missing_files"):
+                    logging.info(
+                        evidence.add(
+                            "\n".join(locate_result["missing_files"]),
+                            header=">>> [Key Evidence] Files Named in the Criteria but Not Found in the Workspace:\n\n",
+                            footer="\n\n",
+                            priority=1,
+                        )
+                    )
                 logging.info(
                     f">>> [Reference] Located Files:\n\n{locate_result['file_paths']}\n\n"
                 )
 
             elif info_type == "read" and related_files:
                 for file_path in related_files:
-                    content, llm_stats = self.aaaj_read.read(Path(file_path))
-                    combined_evidence += f">>> [Key Evidence] Content of Files:\n\nContent of {file_path}:\n```\n{truncate_string(content, model=self.llm.model_name, max_tokens=2000)}\n```\n"
+                    content, llm_stats = self.aaaj_read.read_excerpt(
+                        Path(file_path), max_tokens=2000
+                    )
                     logging.info(
-                        f">>> [Key Evidence] Content of Files:\n\nContent of {file_path}:\n```\n{truncate_string(content, model=self.llm.model_name, max_tokens=2000)}\n```\n"
+                        evidence.add(
+                            content,
+                            header=f">>> [Key Evidence] Content of Files:\n\nContent of {file_path}:\n```\n",
+                            footer="\n```\n",
+                            priority=1,
+                            max_tokens=2000,
+                        )
                     )
                     if llm_stats:
-                        total_llm_stats.update(llm_stats)
+                        self._merge_llm_stats(total_llm_stats, llm_stats)
 
             elif info_type == "search":
-                search_list = self.aaaj_search.search(criteria, search_type="embedding")
+                search_list = self.aaaj_search.search(
+                    criteria, search_type="hybrid", top_n=self.config.search_top_n
+                )
                 for search_context in search_list:
-                    combined_evidence += f">>> [Reference] Relevant Search Evidence:\n\n{self.aaaj_search.display(search_context)}\n\n"
                     logging.info(
-                        f">>> [Reference] Relevant Search Evidence:\n\n{self.aaaj_search.display(search_context)}\n\n"
+                        evidence.add(
+                            self.aaaj_search.display(search_context),
+                            header=">>> [Reference] Relevant Search Evidence:\n\n",
+                            footer="\n\n",
+                        )
                     )
 
             elif info_type == "history":
                 if self.aaaj_memory:
                     historical_evidence = self.aaaj_memory.get_historical_evidence()
-                    combined_evidence += f">>> [Reference] Historical Judgments:\n\n{historical_evidence}\n\n"
                     logging.info(
-                        f">>> [Reference] Historical Judgments:\n\n{historical_evidence}\n\n"
+                        evidence.add(
+                            historical_evidence,
+                            header=">>> [Reference] Historical Judgments:\n\n",
+                            footer="\n\n",
+                        )
                     )
                 else:
                     logging.warning(
@@ -302,17 +432,18 @@ class JudgeAgent:
 
             elif info_type == "trajectory":
                 llm_trajectory_stats = self.aaaj_retrieve.llm_summary(criteria)
-                combined_evidence += f">>> [Reference] Trajectory Evidence:\n\n{llm_trajectory_stats.get('trajectory_analysis', '')}\n\n"
                 logging.info(
-                    f">>> [Reference] Trajectory Evidence:\n\n{llm_trajectory_stats.get('trajectory_analysis', '')}\n\n"
+                    evidence.add(
+                        llm_trajectory_stats.get("trajectory_analysis", ""),
+                        header=">>> [Reference] Trajectory Evidence:\n\n",
+                        footer="\n\n",
+                    )
                 )
-                total_llm_stats.update(llm_trajectory_stats)
+                self._merge_llm_stats(total_llm_stats, llm_trajectory_stats)
 
-        combined_evidence = truncate_string(
-            combined_evidence, model=self.llm.model_name
-        )
+        combined_evidence = evidence.build()
         check_llm_stats = self.aaaj_ask.check(criteria, combined_evidence)
-        total_llm_stats.update(check_llm_stats)
+        self._merge_llm_stats(total_llm_stats, check_llm_stats)
         total_time = time.time() - start_time
         
         def format_reason(reason_list):
@@ -339,6 +470,17 @@ class JudgeAgent:
 
         return total_llm_stats, total_time
 
+    @staticmethod
+    def _merge_llm_stats(total_llm_stats: dict, llm_stats: dict):
+        """Overwrite with the latest step's stats but keep cache counters cumulative."""
+        cache_hits = total_llm_stats.get("cache_hits", 0) + llm_stats.get("cache_hits", 0)
+        cache_misses = total_llm_stats.get("cache_misses", 0) + llm_stats.get(
+            "cache_misses", 0
+        )
+        total_llm_stats.update(llm_stats)
+        total_llm_stats["cache_hits"] = cache_hits
+        total_llm_stats["cache_misses"] = cache_misses
+
     def construct_graph(self):
         print('self.workspace', self.workspace)
         filepaths = self.aaaj_graph.list_code_files([str(self.workspace) + '/'])
@@ -348,76 +490,106 @@ class JudgeAgent:
         self._save_graph_and_tags(graph, tags)
         self._save_file_structure()
 
-    def display_tree(self, max_depth: int = None) -> str:
-
-        def add_branch(tree: Tree, structure: dict, current_depth: int):
-            if max_depth is not None and current_depth > max_depth:
-                return
-            for key, value in structure.items():
-                if isinstance(value, dict):
-                    branch = tree.add(f"{key}")
-                    add_branch(branch, value, current_depth + 1)
-                else:
-                    file_label = (
-                        f"[bold white]{key}[/bold white]"
-                        if value
-                        else f"[dim]{key}[/dim]"
+    def display_tree(self, max_depth: int = None, max_tokens: int = None) -> str:
+        """
+        Plain-text project tree, optionally truncated to `max_tokens`.
+
+        The structure does not change during a run, so each rendering is made
+        once and kept in memory and in the judge dir, keyed by a hash of the
+        structure.
+        """
+        # Requirements are checked on threads; render and save one tree at a time
+        with self._tree_cache_lock:
+            if not hasattr(self, "_tree_cache"):
+                self._tree_cache = self._load_tree_cache()
+
+            key = f"{max_depth}:{max_tokens}"
+            if key not in self._tree_cache["trees"]:
+                tree = self._render_tree(max_depth)
+                if max_tokens is not None:
+                    tree = truncate_string(
+                        tree, model=self.llm.model_name, max_tokens=max_tokens
                     )
-                    tree.add(file_label)
-
-        tree = Tree("[bold blue]Project Structure[/bold blue]")
-        add_branch(tree, self.structure["tree_structure"], current_depth=0)
-
-        metadata = Text.from_markup(
-            f"[bold cyan]Workspace Path:[/bold cyan] [bold white]{self.workspace}[/bold white]\n"
-            f"[bold cyan]Total Nodes:[/bold cyan] [bold white]{len(self.structure['tree_structure'])}[/bold white]\n"
+                self._tree_cache["trees"][key] = tree
+                self._save_tree_cache()
+            return self._tree_cache["trees"][key]
+
+    def workspace_summary(self, criteria: str, max_tokens: int = 2000) -> str:
+        """Compact, relevance-ordered directory listing for the locate prompt."""
+
+        try:
+            file_scores = self.aaaj_search.relevant_files(criteria)
+        except Exception as e:
+            logging.warning(f"Failed to score files with the tag index: {e}")
+            file_scores = {}
+        return summarize_workspace(
+            str(self.workspace),
+            self.structure["tree_structure"],
+            criteria,
+            file_scores=file_scores,
+            max_tokens=max_tokens,
         )
 
-        table = Table.grid(expand=True)
-        table.add_column(justify="left")
-        table.add_row(metadata)
-        table.add_row(tree)
+    def _render_tree(self, max_depth: int = None) -> str:
 
-        combined_panel = Panel(
-            table,
-            title="[bold magenta]Project Tree[/bold magenta]",
-            border_style="bold blue",
-            title_align="left",
-            padding=(1, 2),
-            expand=True,
-        )
+        lines = [
+            "Project Tree",
+            f"Workspace Path: {self.workspace}",
+            f"Total Nodes: {len(self.structure['tree_structure'])}",
+            "",
+            "Project Structure",
+        ]
 
-        with io.StringIO() as buf:
-            console = Console(record=True, width=120)
-            console.print(combined_panel, soft_wrap=True)
-            return console.export_text()
+        def add_branch(structure: dict, prefix: str, current_depth: int):
+            if max_depth is not None and current_depth > max_depth:
+                return
+            for i, (key, value) in enumerate(structure.items()):
+                last = i == len(structure) - 1
+                lines.append(f"{prefix}{'└── ' if last else '├── '}{key}")
+                if isinstance(value, dict):
+                    add_branch(value, prefix + ("    " if last else "│   "), current_depth + 1)
+
+        add_branch(self.structure["tree_structure"], "", current_depth=0)
+        return "\n".join(lines) + "\n"
+
+    def _load_tree_cache(self) -> dict:
+
+        fingerprint = hashlib.sha256(
+            json.dumps(self.structure, sort_keys=True).encode("utf-8")
+        ).hexdigest()
+        try:
+            with open(self.tree_cache_file, "r", encoding="utf-8") as f:
+                cache = json.load(f)
+            if cache.get("fingerprint") == fingerprint:
+                return cache
+        except FileNotFoundError:
+            pass
+        except (OSError, json.JSONDecodeError) as e:
+            logging.warning(f"Failed to load the workspace tree cache: {e}")
+        return {"fingerprint": fingerprint, "trees": {}}
+
+    def _save_tree_cache(self):
+
+        tmp_file = self.tree_cache_file.with_suffix(
+            f".{os.getpid()}.{threading.get_ident()}.tmp"
+        )
+        try:
+            with open(tmp_file, "w", encoding="utf-8") as f:
+                json.dump(self._tree_cache, f, ensure_ascii=False)
+            os.replace(tmp_file, self.tree_cache_file)
+        except OSError as e:
+            logging.warning(f"Failed to save the workspace tree cache: {e}")
 
     def _save_graph_and_tags(self, graph, tags):
 
         logging.info("Saving the graph and tags...")
         with open(self.graph_file, "wb") as f:
             pickle.dump(graph, f)
-        with open(self.tags_file, "w") as f:
-            json.dump(
-                (
-                    [
-                        {
-                            "fname": tag.fname,
-                            "rel_fname": tag.rel_fname,
-                            "line_number": tag.line,
-                            "name": tag.name,
-                            "identifier": tag.identifier,
-                            "category": tag.category,
-                            "details": tag.details,
-                        }
-                        for tag in tags
-                    ]
-                    if tags
-                    else {}
-                ),
-                f,
-                indent=4,
-            )
+        TagStore.write(self.judge_workspace, tags)
+        TagIndex.build(
+            TagStore.open(self.judge_workspace),
+            TagIndex.signature_of(self.tags_file),
+        ).save(self.judge_workspace / TagIndex.INDEX_FILE)
 
     def _save_file_structure(self):
 
@@ -447,9 +619,49 @@ class JudgeAgent:
         with open(save_path, "w", encoding="utf-8") as f:
             json.dump(self.workspace_info, f, indent=4)
 
-    def locate_file(self, criteria: str, workspace_info: str) -> dict:
+    def locate_file(self, criteria: str) -> dict:
+        """
+        Files relevant to the criteria, in two stages.
+
+        Files the criteria names explicitly are returned without an LLM call.
+        Otherwise a lexical prefilter ranks candidate files, and the LLM picks
+        from them with a compact workspace overview as a fallback.
+        """
 
-        return self.aaaj_locate.locate_file(criteria, workspace_info)
+        found, missing = DevLocate.match_named_files(
+            criteria, str(self.workspace), self.structure["tree_structure"]
+        )
+        if missing:
+            logging.info(f"Files named in the criteria but not found: {missing}")
+        if found:
+            logging.info(f"Criteria names existing files, skipping the LLM: {found}")
+            return {
+                "file_paths": [str(Path(self.workspace) / path) for path in found[:5]],
+                "missing_files": missing,
+                "llm_stats": {},
+            }
+
+        try:
+            candidates = self.aaaj_search.candidate_files(
+                criteria, search_top_n=self.config.search_top_n
+            )
+        except Exception as e:
+            logging.warning(f"Failed to prefilter files for locate: {e}")
+            candidates = []
+
+        workspace_info = ""
+        if candidates:
+            workspace_info = (
+                "Candidate files, most likely first:\n"
+                + "\n".join(str(Path(self.workspace) / path) for path in candidates)
+                + "\n\nWorkspace overview:\n"
+            )
+        workspace_info += self.workspace_summary(
+            criteria, max_tokens=1000 if candidates else 2000
+        )
+        locate_result = self.aaaj_locate.locate_file(criteria, workspace_info)
+        locate_result["missing_files"] = missing
+        return locate_result
 
     def display_judgment(
         self, criteria: str, satisfied: bool, reason: str, logger: logging.Logger
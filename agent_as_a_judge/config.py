@@ -14,6 +14,9 @@ class AgentConfig:
     workspace_dir: Optional[Path] = None
     instance_dir: Optional[Path] = None
     trajectory_file: Optional[Path] = None
+    max_concurrency: int = 1
+    cache_dir: Optional[Path] = None
+    search_top_n: int = 5
 
     @classmethod
     def from_args(cls, args):
@@ -40,4 +43,12 @@ class AgentConfig:
             trajectory_file=(
                 Path(args.trajectory_file) if args.trajectory_file else None
             ),
+            max_concurrency=(
+                args.max_concurrency if hasattr(args, "max_concurrency") else 1
+            ),
+            cache_dir=(
+                Path(args.cache_dir)
+                if getattr(args, "cache_dir", None)
+                else None
+            ),
         )
@@ -0,0 +1,140 @@
+import os
+import json
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+__all__ = ["ResponseCache"]
+
+
+class ResponseCache:
+    """
+    On-disk, content-addressed cache for deterministic LLM responses.
+
+    Entries are keyed by a SHA-256 of the model, the messages and the sampling
+    parameters, and stored in a SQLite file so several worker processes can share
+    it. When the total payload grows above `max_bytes`, the least recently used
+    entries are evicted.
+    """
+
+    _instances = {}
+    _instances_lock = threading.Lock()
+
+    def __init__(self, cache_dir: Path = None, max_bytes: int = None):
+        self.cache_dir = Path(
+            cache_dir
+            or os.getenv(
+                "LLM_CACHE_DIR",
+                Path.home() / ".cache" / "agent_as_a_judge" / "llm",
+            )
+        )
+        self.max_bytes = int(
+            max_bytes or os.getenv("LLM_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+        )
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.db_file = self.cache_dir / "responses.sqlite"
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            str(self.db_file), timeout=30, check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, value TEXT NOT NULL, "
+            "size INTEGER NOT NULL, last_access REAL NOT NULL)"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS responses_last_access ON responses (last_access)"
+        )
+        self._conn.commit()
+
+    @classmethod
+    def get(cls, cache_dir: Path = None) -> "ResponseCache":
+        key = str(cache_dir or os.getenv("LLM_CACHE_DIR", ""))
+        with cls._instances_lock:
+            if key not in cls._instances:
+                cls._instances[key] = cls(cache_dir)
+            return cls._instances[key]
+
+    @staticmethod
+    def make_key(model: str, messages: list, params: dict) -> str:
+        payload = json.dumps(
+            {"model": model, "messages": messages, "params": params},
+            sort_keys=True,
+            ensure_ascii=False,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def lookup(self, key: str):
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self._conn.execute(
+                "UPDATE responses SET last_access = ? WHERE key = ?",
+                (time.time(), key),
+            )
+            self._conn.commit()
+            self.hits += 1
+        return json.loads(row[0])
+
+    def store(self, key: str, value: dict):
+        data = json.dumps(value, ensure_ascii=False, default=str)
+        size = len(data.encode("utf-8"))
+        if size > self.max_bytes:
+            logging.warning(
+                f"LLM response of {size} bytes exceeds the cache size limit, not caching it."
+            )
+            return
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses (key, value, size, last_access) "
+                "VALUES (?, ?, ?, ?)",
+                (key, data, size, time.time()),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM responses"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = 0
+        for key, size in self._conn.execute(
+            "SELECT key, size FROM responses ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+            evicted += 1
+        logging.info(f"Evicted {evicted} entries from the LLM response cache.")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, total = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": entries,
+            "bytes": total,
+        }
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
@@ -0,0 +1,118 @@
+import os
+import json
+import logging
+import threading
+import urllib.request
+from typing import List, Union
+
+import numpy as np
+
+__all__ = ["EmbeddingService"]
+
+DEFAULT_EMBEDDING_MODEL = "/workspace-SR003.nfs2/all-MiniLM-L6-v2"
+
+
+class EmbeddingService:
+    """
+    Process-wide sentence embedding service shared by the search modules.
+
+    The SentenceTransformer named by `EMBEDDING_MODEL` is loaded on the first
+    `encode`, not when a module is created. When `EMBEDDING_SERVICE_URL` is set,
+    texts are sent to a shared local embedding server instead
+    (`python -m scripts.embedding_server`), so several workers use one model copy.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    # Texts per encode call; also the unit a server request can time out on
+    BATCH_SIZE = 512
+
+    def __init__(
+        self,
+        model_name: str = None,
+        service_url: str = None,
+        timeout: float = 120,
+        batch_size: int = BATCH_SIZE,
+    ):
+        self.service_url = (service_url or "").rstrip("/") or None
+        self._model_name = model_name
+        self.timeout = timeout
+        self.batch_size = batch_size
+        self._model = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "EmbeddingService":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls(
+                        model_name=os.getenv("EMBEDDING_MODEL"),
+                        service_url=os.getenv("EMBEDDING_SERVICE_URL"),
+                    )
+        return cls._instance
+
+    @property
+    def model_name(self) -> str:
+        """Name of the model behind the embeddings, used to key persisted vectors."""
+        if self._model_name is None:
+            if self.service_url:
+                self._model_name = self._request("/info")["model"]
+            else:
+                self._model_name = DEFAULT_EMBEDDING_MODEL
+        return self._model_name
+
+    @property
+    def model(self):
+        if self._model is None:
+            with self._lock:
+                if self._model is None:
+                    # Imported here: torch alone takes seconds to import
+                    from sentence_transformers import SentenceTransformer
+
+                    logging.info(f"Loading embedding model {self.model_name}...")
+                    self._model = SentenceTransformer(self.model_name)
+        return self._model
+
+    def warm_up(self):
+        """Load the model (or reach the embedding server) ahead of the first search."""
+        if self.service_url:
+            logging.info(f"Using embedding server {self.service_url} ({self.model_name})")
+        else:
+            self.model
+
+    def encode(self, texts: Union[str, List[str]]) -> np.ndarray:
+        """Embeddings as float32: one vector for a string, a matrix for a list."""
+        single = isinstance(texts, str)
+        batch = [texts] if single else list(texts)
+
+        # Bounded requests: a whole repository in one call is hundreds of MB of JSON
+        chunks = [
+            batch[i : i + self.batch_size] for i in range(0, len(batch), self.batch_size)
+        ] or [batch]
+        embeddings = np.concatenate([self._encode_chunk(chunk) for chunk in chunks])
+
+        return embeddings[0] if single else embeddings
+
+    def _encode_chunk(self, texts: List[str]) -> np.ndarray:
+        if not texts:
+            return np.empty((0, 0), dtype=np.float32)
+        if self.service_url:
+            return np.asarray(
+                self._request("/encode", {"texts": texts})["embeddings"],
+                dtype=np.float32,
+            ).reshape(len(texts), -1)
+        model = self.model
+        with self._lock:
+            return np.asarray(model.encode(texts), dtype=np.float32).reshape(len(texts), -1)
+
+    def _request(self, path: str, payload: dict = None) -> dict:
+        data = json.dumps(payload).encode("utf-8") if payload is not None else None
+        request = urllib.request.Request(
+            self.service_url + path,
+            data=data,
+            headers={"Content-Type": "application/json"},
+        )
+        with urllib.request.urlopen(request, timeout=self.timeout) as response:
+            return json.loads(response.read().decode("utf-8"))
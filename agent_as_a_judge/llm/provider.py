@@ -8,7 +8,7 @@ with warnings.catch_warnings():
     warnings.simplefilter("ignore")
     import litellm
 
-from litellm import completion as litellm_completion
+from litellm import acompletion as litellm_acompletion
 from litellm import completion_cost as litellm_completion_cost
 from litellm.exceptions import (
     APIConnectionError,
@@ -22,6 +22,9 @@ from tenacity import (
     wait_random_exponential,
 )
 
+from agent_as_a_judge.llm.cache import ResponseCache
+from agent_as_a_judge.llm.session import LLMSession
+
 os.environ["LITELLM_LOG"] = "DEBUG"
 
 __all__ = ["LLM"]
@@ -46,6 +49,7 @@ class LLM:
         max_input_tokens=4096,
         max_output_tokens=2048,
         cost=None,
+        use_cache=True,
     ):
 
         from agent_as_a_judge.llm.cost import Cost
@@ -64,6 +68,7 @@ class LLM:
         self.retry_min_wait = retry_min_wait
         self.retry_max_wait = retry_max_wait
         self.custom_llm_provider = custom_llm_provider
+        self.use_cache = use_cache and os.getenv("LLM_CACHE", "1") != "0"
 
         self.model_info = None
         try:
@@ -80,7 +85,7 @@ class LLM:
 
     def _initialize_completion_function(self):
         completion_func = partial(
-            litellm_completion,
+            litellm_acompletion,
             model=self.model_name,
             api_key=self.api_key,
             base_url=self.base_url,
@@ -107,19 +112,35 @@ class LLM:
             ),
             after=attempt_on_error,
         )
-        def wrapper(*args, **kwargs):
+        async def async_wrapper(*args, **kwargs):
 
-            resp = completion_func(*args, **kwargs)
+            # The in-flight slot is held per attempt, so retries back off without blocking others
+            resp = await self.session.limited(completion_func, *args, **kwargs)
             message_back = resp["choices"][0]["message"]["content"]
             # logger.debug(message_back)
             return resp, message_back
 
+        async def acompletion(*args, **kwargs):
+            return await self.session.submit(async_wrapper(*args, **kwargs))
+
+        def wrapper(*args, **kwargs):
+            return self.session.run(async_wrapper(*args, **kwargs))
+
+        self._acompletion = acompletion
         self._completion = wrapper
 
+    @property
+    def session(self) -> LLMSession:
+        return LLMSession.get()
+
     @property
     def completion(self):
         return self._completion
 
+    @property
+    def acompletion(self):
+        return self._acompletion
+
     def _llm_inference(self, messages: list) -> dict:
         """Perform LLM inference using the provided messages."""
         start_time = time.time()
@@ -127,7 +148,19 @@ class LLM:
             messages=messages, temperature=0.0
         )
         inference_time = time.time() - start_time
+        return self._inference_stats(response, cost, accumulated_cost, inference_time)
+
+    async def _allm_inference(self, messages: list) -> dict:
+        """Async counterpart of `_llm_inference`."""
+        start_time = time.time()
+        response, cost, accumulated_cost = await self.ado_completion(
+            messages=messages, temperature=0.0
+        )
+        inference_time = time.time() - start_time
+        return self._inference_stats(response, cost, accumulated_cost, inference_time)
 
+    @staticmethod
+    def _inference_stats(response, cost, accumulated_cost, inference_time) -> dict:
         llm_response = response.choices[0].message["content"]
         input_token, output_token = (
             response.usage.prompt_tokens,
@@ -141,13 +174,73 @@ class LLM:
             "cost": cost,
             "accumulated_cost": accumulated_cost,
             "inference_time": inference_time,
+            **LLM.cache_stats(response),
         }
 
     def do_completion(self, *args, **kwargs):
-        resp, msg = self._completion(*args, **kwargs)
+        cache_key = self._cache_key(args, kwargs)
+        resp = self._cache_lookup(cache_key)
+        if resp is None:
+            resp, msg = self._completion(*args, **kwargs)
+            self._cache_store(cache_key, resp)
         cur_cost, accumulated_cost = self.post_completion(resp)
         return resp, cur_cost, accumulated_cost
 
+    async def ado_completion(self, *args, **kwargs):
+        cache_key = self._cache_key(args, kwargs)
+        resp = self._cache_lookup(cache_key)
+        if resp is None:
+            resp, msg = await self._acompletion(*args, **kwargs)
+            self._cache_store(cache_key, resp)
+        cur_cost, accumulated_cost = self.post_completion(resp)
+        return resp, cur_cost, accumulated_cost
+
+    @property
+    def response_cache(self) -> ResponseCache:
+        return ResponseCache.get()
+
+    def _cache_key(self, args: tuple, kwargs: dict):
+        """Return the cache key for deterministic (temperature 0) calls, else None."""
+        if not self.use_cache or args or "messages" not in kwargs:
+            return None
+        params = {
+            "temperature": self.llm_temperature,
+            "top_p": self.llm_top_p,
+            "max_tokens": self.max_output_tokens,
+            "base_url": self.base_url,
+            **{key: value for key, value in kwargs.items() if key != "messages"},
+        }
+        if params["temperature"] != 0:
+            return None
+        return ResponseCache.make_key(self.model_name, kwargs["messages"], params)
+
+    def _cache_lookup(self, cache_key):
+        if cache_key is None:
+            return None
+        cached = self.response_cache.lookup(cache_key)
+        if cached is None:
+            return None
+        response = litellm.ModelResponse(**cached)
+        response._hidden_params["cache_hit"] = True
+        return response
+
+    def _cache_store(self, cache_key, response):
+        if cache_key is None:
+            return
+        try:
+            self.response_cache.store(cache_key, response.model_dump())
+        except Exception as e:
+            print(f"Could not cache the response of {self.model_name}: {e}")
+        response._hidden_params["cache_hit"] = False
+
+    @staticmethod
+    def cache_stats(response) -> dict:
+        cache_hit = getattr(response, "_hidden_params", {}).get("cache_hit")
+        return {
+            "cache_hits": int(cache_hit is True),
+            "cache_misses": int(cache_hit is False),
+        }
+
     def post_completion(self, response: str):
         try:
             cur_cost = self.completion_cost(response)
@@ -170,6 +263,9 @@ class LLM:
         return False
 
     def completion_cost(self, response):
+        # A cached response keeps its original usage, but nothing was paid for it
+        if getattr(response, "_hidden_params", {}).get("cache_hit"):
+            return 0.0
         if not self.is_local():
             try:
                 cost = litellm_completion_cost(completion_response=response)
@@ -0,0 +1,106 @@
+import os
+import asyncio
+import threading
+
+import httpx
+import litellm
+
+__all__ = ["LLMSession"]
+
+
+class LLMSession:
+    """
+    Process-wide asyncio runtime shared by every LLM instance.
+
+    It owns a background event loop, one pooled keep-alive HTTP client that
+    litellm uses for all async requests, and a semaphore that caps the number
+    of requests in flight across the whole process.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(
+        self,
+        max_in_flight: int = None,
+        max_keepalive_connections: int = None,
+        keepalive_expiry: float = 60.0,
+    ):
+        self.max_in_flight = int(
+            max_in_flight or os.getenv("LLM_MAX_IN_FLIGHT", 8)
+        )
+        self.max_keepalive_connections = (
+            max_keepalive_connections or self.max_in_flight
+        )
+        self.keepalive_expiry = keepalive_expiry
+
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run_loop, name="llm-session", daemon=True
+        )
+        self._thread.start()
+
+        self.semaphore = None
+        self.client = None
+        self.run(self._setup())
+
+    @classmethod
+    def get(cls) -> "LLMSession":
+        if cls._instance is None:
+            with cls._instance_lock:
+                if cls._instance is None:
+                    cls._instance = cls()
+        return cls._instance
+
+    def _run_loop(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    async def _setup(self):
+        # Both objects bind to the loop they are created on, so build them there
+        self.semaphore = asyncio.Semaphore(self.max_in_flight)
+        self.client = httpx.AsyncClient(
+            limits=httpx.Limits(
+                max_connections=self.max_in_flight,
+                max_keepalive_connections=self.max_keepalive_connections,
+                keepalive_expiry=self.keepalive_expiry,
+            )
+        )
+        litellm.aclient_session = self.client
+
+    def in_session_loop(self) -> bool:
+        return threading.current_thread() is self._thread
+
+    def run(self, coro):
+        """Run a coroutine on the session loop and block until it finishes."""
+        if self.in_session_loop():
+            coro.close()
+            raise RuntimeError(
+                "LLMSession.run() cannot block inside the session loop; await the coroutine instead."
+            )
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def submit(self, coro):
+        """Await a coroutine on the session loop from any event loop."""
+        if self.in_session_loop():
+            return await coro
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        return await asyncio.wrap_future(future)
+
+    async def limited(self, func, *args, **kwargs):
+        """Call an async function while holding one of the in-flight slots."""
+        async with self.semaphore:
+            return await func(*args, **kwargs)
+
+    def close(self):
+        if self.client is not None:
+            self.run(self.client.aclose())
+            if litellm.aclient_session is self.client:
+                litellm.aclient_session = None
+            self.client = None
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
+        self.loop.close()
+        with LLMSession._instance_lock:
+            if LLMSession._instance is self:
+                LLMSession._instance = None
@@ -88,6 +88,8 @@ class DevAsk:
             "inference_time": 0.0,
             "input_tokens": 0,
             "output_tokens": 0,
+            "cache_hits": 0,
+            "cache_misses": 0,
         }
 
     @staticmethod
@@ -96,6 +98,8 @@ class DevAsk:
         stats["inference_time"] += result.get("inference_time", 0)
         stats["input_tokens"] += result.get("input_tokens", 0)
         stats["output_tokens"] += result.get("output_tokens", 0)
+        stats["cache_hits"] += result.get("cache_hits", 0)
+        stats["cache_misses"] += result.get("cache_misses", 0)
 
     def ask(self, question: str, evidence: str) -> str:
         if not evidence:
@@ -0,0 +1,195 @@
+import os
+import re
+import hashlib
+import logging
+import tempfile
+from pathlib import Path
+from typing import Iterable, List
+
+import numpy as np
+
+__all__ = ["BM25Index", "tokenize", "corpus_fingerprint"]
+
+_WORD_RE = re.compile(r"[A-Za-z0-9_]+")
+_SUBWORD_RE = re.compile(r"[A-Z]+(?=[A-Z][a-z])|[A-Z]?[a-z]+|[A-Z]+|\d+")
+
+STOP_WORDS = frozenset(
+    """
+    a an and are as at be been but by can could did do does for from had has have
+    how i if in into is it its may must of on or should so such than that the their
+    them then there these they this those to was we were what when where which while
+    who will with would you your
+    """.split()
+)
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Lowercase terms of natural language and code alike.
+
+    Identifiers are split on snake_case and camelCase boundaries, keeping the
+    whole identifier too, so `loadUserData` matches both itself and "user data".
+    """
+    tokens = []
+    for word in _WORD_RE.findall(text or ""):
+        parts = [
+            part.lower()
+            for chunk in word.split("_")
+            for part in _SUBWORD_RE.findall(chunk)
+        ]
+        if len(parts) > 1:
+            tokens.append(word.lower())
+        tokens.extend(parts)
+    return [token for token in tokens if len(token) > 1 and token not in STOP_WORDS]
+
+
+def corpus_fingerprint(documents: Iterable[str]) -> str:
+    digest = hashlib.sha256()
+    for document in documents:
+        digest.update(document.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class BM25Index:
+    """
+    Okapi BM25 over an inverted index held in NumPy arrays.
+
+    Postings are stored CSR-style (`term_ptr`, `doc_ids`) together with each
+    posting's precomputed term-frequency weight, so scoring a query is a gather
+    and one `np.bincount`. Parameters and the idf floor follow rank_bm25's
+    BM25Okapi, so scores match the former implementation.
+    """
+
+    def __init__(self, vocab, term_ptr, doc_ids, weights, idf, n_docs, fingerprint=""):
+        self.vocab = vocab
+        self.term_ptr = term_ptr
+        self.doc_ids = doc_ids
+        self.weights = weights
+        self.idf = idf
+        self.n_docs = int(n_docs)
+        self.fingerprint = fingerprint
+
+    @classmethod
+    def build(
+        cls,
+        corpus: List[List[str]],
+        k1: float = 1.5,
+        b: float = 0.75,
+        epsilon: float = 0.25,
+        fingerprint: str = "",
+    ) -> "BM25Index":
+        vocab = {}
+        term_ids, doc_ids = [], []
+        doc_len = np.zeros(len(corpus), dtype=np.float32)
+        for doc_id, tokens in enumerate(corpus):
+            doc_len[doc_id] = len(tokens)
+            for token in tokens:
+                term_ids.append(vocab.setdefault(token, len(vocab)))
+                doc_ids.append(doc_id)
+
+        term_ids = np.asarray(term_ids, dtype=np.int64)
+        doc_ids = np.asarray(doc_ids, dtype=np.int64)
+        # One posting per (term, doc) with its term frequency, sorted by term
+        pairs, tf = np.unique(term_ids * max(len(corpus), 1) + doc_ids, return_counts=True)
+        posting_terms = pairs // max(len(corpus), 1)
+        posting_docs = (pairs % max(len(corpus), 1)).astype(np.int32)
+
+        df = np.bincount(posting_terms, minlength=len(vocab))
+        term_ptr = np.concatenate([[0], np.cumsum(df)]).astype(np.int64)
+
+        n_docs = len(corpus)
+        idf = np.log(n_docs - df + 0.5) - np.log(df + 0.5)
+        if len(idf):
+            idf = np.where(idf < 0, epsilon * idf.mean(), idf)
+
+        avgdl = doc_len.mean() if n_docs else 0.0
+        norm = k1 * (1 - b + b * doc_len[posting_docs] / max(avgdl, 1e-12))
+        weights = tf * (k1 + 1) / (tf + norm)
+
+        return cls(
+            vocab,
+            term_ptr,
+            posting_docs,
+            weights.astype(np.float32),
+            idf.astype(np.float32),
+            n_docs,
+            fingerprint,
+        )
+
+    def get_scores(self, query_tokens: List[str]) -> np.ndarray:
+        term_ids = [self.vocab[token] for token in query_tokens if token in self.vocab]
+        if not term_ids:
+            return np.zeros(self.n_docs, dtype=np.float32)
+
+        starts, ends = self.term_ptr[term_ids], self.term_ptr[np.asarray(term_ids) + 1]
+        postings = np.concatenate([np.arange(s, e) for s, e in zip(starts, ends)])
+        idf = np.repeat(self.idf[term_ids], ends - starts)
+        return np.bincount(
+            self.doc_ids[postings],
+            weights=self.weights[postings] * idf,
+            minlength=self.n_docs,
+        ).astype(np.float32)
+
+    def top_n(self, query: str, n: int = 10, scores: np.ndarray = None) -> np.ndarray:
+        """Indices of the `n` best documents for the query (or given scores), best first."""
+        if scores is None:
+            scores = self.get_scores(tokenize(query))
+        n = min(n, self.n_docs)
+        if n <= 0:
+            return np.empty(0, dtype=np.int64)
+        top = np.argpartition(-scores, n - 1)[:n]
+        return top[np.lexsort((top, -scores[top]))]
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique per writer, so threads of one process never share a temp file
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+        ) as f:
+            np.savez(
+                f,
+                vocab=np.array(list(self.vocab), dtype=str),
+                term_ptr=self.term_ptr,
+                doc_ids=self.doc_ids,
+                weights=self.weights,
+                idf=self.idf,
+                n_docs=np.array(self.n_docs),
+                fingerprint=np.array(self.fingerprint),
+            )
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path: Path, fingerprint: str = None) -> "BM25Index":
+        """The saved index, or None when missing or built from another corpus."""
+        try:
+            with np.load(path) as data:
+                if fingerprint is not None and str(data["fingerprint"]) != fingerprint:
+                    return None
+                vocab = {token: i for i, token in enumerate(data["vocab"].tolist())}
+                return cls(
+                    vocab,
+                    data["term_ptr"],
+                    data["doc_ids"],
+                    data["weights"],
+                    data["idf"],
+                    int(data["n_docs"]),
+                    str(data["fingerprint"]),
+                )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Failed to load BM25 index {path}: {e}")
+            return None
+
+    @classmethod
+    def load_or_build(cls, path: Path, documents: List[str]) -> "BM25Index":
+        fingerprint = corpus_fingerprint(documents)
+        index = cls.load(path, fingerprint) if path else None
+        if index is None:
+            logging.info(f"Building BM25 index over {len(documents)} documents...")
+            index = cls.build([tokenize(doc) for doc in documents], fingerprint=fingerprint)
+            if path:
+                index.save(path)
+        return index
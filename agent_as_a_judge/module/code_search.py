@@ -6,15 +6,15 @@ import os
 import io
 import json
 import pickle
+import hashlib
 import logging
+import threading
 import numpy as np
+from collections import Counter
 from typing import List, Dict, Any, Generator, Union
 import networkx as nx
-import spacy
 from dotenv import load_dotenv
 from pathlib import Path
-from rank_bm25 import BM25Okapi
-from sentence_transformers import SentenceTransformer, util
 from rich.logging import RichHandler
 from rich.console import Console
 from rich.table import Table
@@ -23,6 +23,14 @@ from rich.tree import Tree
 from rich.text import Text
 from rich.syntax import Syntax
 
+from agent_as_a_judge.llm.embedding import EmbeddingService
+from agent_as_a_judge.module.tag_store import TagStore
+from agent_as_a_judge.module.tag_index import TagIndex
+from agent_as_a_judge.utils import fuzzy_top_k
+from agent_as_a_judge.module.bm25_index import BM25Index, tokenize
+from agent_as_a_judge.module.embedding_index import EmbeddingIndex
+from agent_as_a_judge.module.vector_index import build_vector_index
+
 console = Console()
 logging.basicConfig(
     level=logging.INFO,
@@ -32,22 +40,38 @@ logging.basicConfig(
 
 
 class DevCodeSearch:
-    def __init__(self, judge_path: str, setting: str = None):
+    # Dense and lexical candidates fused per hybrid query
+    HYBRID_CANDIDATES = 50
+
+    def __init__(self, judge_path: str, setting: str = None, cache_dir: Path = None):
         self.judge_path = Path(judge_path)
         self.graph_file = self.judge_path / "graph.pkl"
-        self.tags_file = self.judge_path / "tags.json"
+        self.tags_file = self.judge_path / TagStore.TABLE_FILE
+        self.legacy_tags_file = self.judge_path / "tags.json"
         self.structure_file = self.judge_path / "tree_structure.json"
         self.setting = setting
 
         self.workspace = self.load_workspace()
+        # The embedding store is content-addressed, so all workspaces can share it
+        self.embeddings_dir = Path(cache_dir) if cache_dir else self.judge_path
         self.graph = self.load_graph()
         self.tags = self.load_tags()
         self.structure = self.load_structure()
-        self.tree = self.load_tree()
-        self.spacy_nlp = None
+        # Rendered on first use; the agent's evidence uses its own cached tree
+        self._tree = None
+        self._tag_index = None
+        self._workspace_files = None
+        self._fuzzy_fields = None
+        self._lexical_mask = None
+        # Guards the lazily built indexes, which concurrent requirements share
+        self._build_lock = threading.RLock()
         self.bm25 = None
-        self.embedding_model = SentenceTransformer("/workspace-SR003.nfs2/all-MiniLM-L6-v2")
+        self.embedding_service = EmbeddingService.get()
         self.code_embeddings = None
+        self.tag_rows = None
+        self.row_to_tags = None
+        self.vector_index = None
+        self.query_results = {}
 
     def search(
         self, query: str, search_type: str = "embedding", **kwargs
@@ -56,21 +80,24 @@ class DevCodeSearch:
         if search_type == "accurate":
             return list(self.accurate_search(query=query, **kwargs))
         elif search_type == "fuzzy":
-            return self.fuzzy_search(query=query, threshold=kwargs.get("threshold", 70))
+            return self.fuzzy_search(
+                query=query,
+                threshold=kwargs.get("threshold", 70),
+                top_n=kwargs.get("top_n"),
+            )
         elif search_type == "bm25":
             return self.bm25_search(query=query, top_n=kwargs.get("top_n", 3))
         elif search_type == "embedding":
-            return self.embed_search(query=query, top_n=kwargs.get("top_n", 10))
+            return self.embed_search(
+                query=query, top_n=kwargs.get("top_n", 10), filters=kwargs.get("filters")
+            )
+        elif search_type == "hybrid":
+            return self.hybrid_search(
+                query=query, top_n=kwargs.get("top_n", 5), filters=kwargs.get("filters")
+            )
         else:
             raise ValueError(f"Unsupported search_type: {search_type}")
 
-    @property
-    def nlp(self):
-
-        if self.spacy_nlp is None:
-            self.spacy_nlp = spacy.load("en_core_web_sm")
-        return self.spacy_nlp
-
     def load_graph(self) -> nx.MultiDiGraph:
 
         try:
@@ -83,10 +110,16 @@ class DevCodeSearch:
             logging.error(f"Unexpected error when loading graph: {e}")
             return nx.MultiDiGraph()
 
-    def load_tags(self) -> List[Dict[str, Any]]:
+    def load_tags(self) -> Union[TagStore, List[Dict[str, Any]]]:
+
+        if TagStore.exists(self.judge_path):
+            try:
+                return TagStore.open(self.judge_path)
+            except Exception as e:
+                logging.warning(f"Failed to open tag store, falling back to tags.json: {e}")
 
         try:
-            with open(self.tags_file, "r") as f:
+            with open(self.legacy_tags_file, "r") as f:
                 return json.load(f)
         except (FileNotFoundError, json.JSONDecodeError) as e:
             logging.warning(f"Failed to load tags: {e}")
@@ -102,6 +135,15 @@ class DevCodeSearch:
             logging.warning(f"Failed to load workspace: {e}")
             return ""
 
+    @property
+    def tree(self) -> str:
+
+        if self._tree is None:
+            with self._build_lock:
+                if self._tree is None:
+                    self._tree = self.load_tree()
+        return self._tree
+
     def load_tree(self) -> str:
 
         def add_branch(tree: Tree, structure: Dict[str, Any]):
@@ -137,97 +179,441 @@ class DevCodeSearch:
     def accurate_search(
         self, query: str = None, **kwargs: Union[str, int]
     ) -> Generator[Dict[str, Any], None, None]:
+        """
+        Tags containing the query in name, category, identifier or details, or,
+        with keyword arguments, tags whose every given field contains its value.
+        Matching is a case-insensitive substring test answered by the tag index.
+        """
 
         if kwargs:
-            for tag in self.tags:
-                match = all(
-                    value.lower() in tag.get(key, "").lower()
-                    for key, value in kwargs.items()
+            matches = None
+            for key, value in kwargs.items():
+                hits = self._accurate_matches(key, str(value))
+                matches = (
+                    hits
+                    if matches is None
+                    else np.intersect1d(matches, hits, assume_unique=True)
                 )
-                if match:
-                    yield tag
         elif query:
-            for tag in self.tags:
-                if any(
-                    query.lower() in tag.get(field, "").lower()
-                    for field in ["name", "category", "identifier", "details"]
-                ):
-                    yield tag
-
-    def fuzzy_search(self, query: str, threshold: int = 70) -> List[Dict[str, Any]]:
-        """Perform a fuzzy search on all tags and return results above the threshold."""
-        from fuzzywuzzy import fuzz
-
-        query = query.lower()
-        results = [
-            tag
-            for tag in self.tags
-            if max(
-                fuzz.partial_ratio(query, tag.get("name", "").lower()),
-                fuzz.partial_ratio(query, tag.get("details", "").lower()),
-                fuzz.partial_ratio(query, tag.get("category", "").lower()),
-                fuzz.partial_ratio(query, tag.get("identifier", "").lower()),
+            matches = np.unique(
+                np.concatenate(
+                    [
+                        self._accurate_matches(field, query)
+                        for field in ["name", "category", "identifier", "details"]
+                    ]
+                )
             )
-            >= threshold
+        else:
+            return
+
+        for i in matches.tolist():
+            yield self.tags[i]
+
+    def _accurate_matches(self, field: str, value: str) -> np.ndarray:
+
+        if field in TagIndex.FIELDS:
+            return self.tag_index.contains(field, value)
+        # Fields outside the index, e.g. fname, are still scanned
+        return np.flatnonzero(
+            [value.lower() in str(tag.get(field, "")).lower() for tag in self.tags]
+        )
+
+    def find_tags(self, field: str, value: str) -> List[Dict[str, Any]]:
+        """Tags whose `field` equals `value` (ignoring case), e.g. `find_tags("name", "main")`."""
+
+        return [self.tags[i] for i in self.tag_index.lookup(field, value).tolist()]
+
+    def relevant_files(self, query: str, max_share: float = 0.05) -> Dict[str, float]:
+        """
+        Files scored by how many query terms name their tags, rarer terms counting more.
+
+        Terms found in the names of more than `max_share` of all tags are ignored.
+        """
+
+        if not len(self.tags):
+            return {}
+        rel_fnames = (
+            self.tags.column("rel_fname")
+            if isinstance(self.tags, TagStore)
+            else [tag.get("rel_fname") for tag in self.tags]
+        )
+        scores = Counter()
+        for term in set(tokenize(query)):
+            if len(term) < 3:
+                continue
+            hits = self.tag_index.contains("name", term)
+            if not len(hits) or len(hits) > max_share * len(self.tags):
+                continue
+            idf = float(np.log(len(self.tags) / len(hits)))
+            for rel_fname in {rel_fnames[i] for i in hits.tolist()}:
+                if rel_fname:
+                    scores[rel_fname.replace(os.sep, "/")] += idf
+        return dict(scores)
+
+    def candidate_files(
+        self, query: str, top_n: int = 30, search_top_n: int = 5, rrf_k: int = 60
+    ) -> List[str]:
+        """
+        Workspace files most likely to matter for the query, best first.
+
+        Fuses, by reciprocal rank, three cheap rankings: query terms in the file
+        path, query terms in the file's tag names (`relevant_files`), and the
+        files of the best search hits. Those are hybrid hits when the query's
+        embedding results are already in `query_results` (a planned search step
+        precomputed them), else BM25 hits: locating never embeds the repository.
+        """
+
+        files = self.workspace_files
+        terms = [term for term in set(tokenize(query)) if len(term) >= 3]
+        path_scores = {
+            path: sum(term in path.lower() for term in terms) for path in files
+        }
+        tag_scores = self.relevant_files(query)
+        searched = self.code_embeddings is not None and (
+            query,
+            max(self.HYBRID_CANDIDATES, search_top_n),
+        ) in self.query_results
+        hits = (
+            self.hybrid_search(query, top_n=search_top_n)
+            if searched
+            else self.bm25_search(query, top_n=search_top_n)
+        )
+
+        rankings = [
+            sorted((p for p in path_scores if path_scores[p]), key=lambda p: -path_scores[p]),
+            sorted(tag_scores, key=lambda p: -tag_scores[p]),
+            list(dict.fromkeys(tag["rel_fname"].replace(os.sep, "/") for tag in hits)),
         ]
-        return results
+        known = set(files)
+        fused = Counter()
+        for ranking in rankings:
+            for rank, path in enumerate(ranking):
+                if not known or path in known:
+                    fused[path] += 1.0 / (rrf_k + rank + 1)
+        return sorted(fused, key=lambda p: (-fused[p], p))[:top_n]
+
+    @property
+    def workspace_files(self) -> List[str]:
+        """Files of the workspace structure, relative to its root."""
+
+        if self._workspace_files is None:
+            self._workspace_files = [
+                filename if directory == "." else f"{directory}/{filename}"
+                for directory, listing in self.structure.get("tree_structure", {}).items()
+                for filename in listing or {}
+            ]
+        return self._workspace_files
+
+    @property
+    def tag_index(self) -> TagIndex:
+
+        if self._tag_index is None:
+            with self._build_lock:
+                if self._tag_index is None:
+                    tags_file = (
+                        self.tags_file
+                        if isinstance(self.tags, TagStore)
+                        else self.legacy_tags_file
+                    )
+                    self._tag_index = TagIndex.load_or_build(
+                        self.judge_path / TagIndex.INDEX_FILE,
+                        self.tags,
+                        TagIndex.signature_of(tags_file),
+                    )
+        return self._tag_index
+
+    def fuzzy_search(
+        self, query: str, threshold: int = 70, top_n: int = None
+    ) -> List[Dict[str, Any]]:
+        """Tags whose name, details, category or identifier fuzzily match the query."""
+
+        return [
+            self.tags[i]
+            for i in fuzzy_top_k(query, self.fuzzy_fields, threshold, top_n)
+        ]
+
+    @property
+    def fuzzy_fields(self) -> List[List[str]]:
+        """Lowercased fuzzy search fields, one list per field, built once."""
+
+        if self._fuzzy_fields is None:
+            with self._build_lock:
+                if self._fuzzy_fields is None:
+                    fields = ("name", "details", "category", "identifier")
+                    if isinstance(self.tags, TagStore):
+                        columns = {
+                            "name": self.tags.column("name"),
+                            "details": [
+                                self.tags.get_details(i)
+                                for i in range(len(self.tags))
+                            ],
+                            "category": self.tags.column("category"),
+                            "identifier": self.tags.column("identifier"),
+                        }
+                    else:
+                        columns = {
+                            field: [tag.get(field) for tag in self.tags]
+                            for field in fields
+                        }
+                    self._fuzzy_fields = [
+                        [(value or "").lower() for value in columns[field]]
+                        for field in fields
+                    ]
+        return self._fuzzy_fields
 
     def bm25_search(self, query: str, top_n: int = 10) -> List[Dict[str, Any]]:
 
         if not self.tags:
             logging.warning("No tags available for BM25 search.")
             return []
+        # Placeholder tags rank after every other tag and are never returned
+        scores = self.bm25_index.get_scores(tokenize(query))
+        scores[~self.lexical_mask] = -np.inf
+        top_n_indices = self.bm25_index.top_n(query, top_n, scores=scores)
+        return [self.tags[i] for i in top_n_indices.tolist() if np.isfinite(scores[i])]
+
+    @property
+    def lexical_mask(self) -> np.ndarray:
+        """
+        Tags BM25 may return: those with a source span and real details.
+
+        The `details="none"` tags graph.py adds for bare tokens have a scalar
+        line of -1 and nothing to show; their short documents would otherwise
+        win exact name matches. `_embedding_text` drops them on the dense side.
+        """
+
+        if self._lexical_mask is None:
+            if isinstance(self.tags, TagStore):
+                mask = np.asarray(self.tags.table.column("line_end").is_valid(), dtype=bool)
+                lengths = np.asarray(self.tags.table.column("details_length"))
+                for i in np.flatnonzero(mask & (lengths == len("none"))).tolist():
+                    mask[i] = self.tags.get_details(i) != "none"
+            else:
+                mask = np.array(
+                    [
+                        isinstance(tag.get("line_number"), (list, tuple))
+                        and tag.get("details") != "none"
+                        for tag in self.tags
+                    ],
+                    dtype=bool,
+                )
+            self._lexical_mask = mask
+        return self._lexical_mask
+
+    @property
+    def bm25_index(self) -> BM25Index:
+
         if self.bm25 is None:
-            self.corpus = [
-                [
-                    token.text.lower()
-                    for token in self.nlp(
-                        tag.get("name", "")
-                        + " "
-                        + tag.get("details", "")
-                        + " "
-                        + tag.get("category", "")
-                        + " "
-                        + tag.get("identifier", "")
+            with self._build_lock:
+                if self.bm25 is None:
+                    self.bm25 = BM25Index.load_or_build(
+                        self.judge_path / "bm25_index.npz",
+                        [
+                            tag.get("name", "")
+                            + " "
+                            + tag.get("details", "")
+                            + " "
+                            + tag.get("category", "")
+                            + " "
+                            + tag.get("identifier", "")
+                            for tag in self.tags
+                        ],
                     )
-                    if not token.is_stop and not token.is_punct
-                ]
-                for tag in self.tags
-            ]
-            self.bm25 = BM25Okapi([doc for doc in self.corpus])
-        tokenized_query = [
-            token.text.lower()
-            for token in self.nlp(query)
-            if not token.is_stop and not token.is_punct
+        return self.bm25
+
+    def embed_search(
+        self, query: str, top_n: int = 3, filters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Tags whose details are closest to the query.
+
+        `filters` restricts the results by tag field, e.g. {"identifier": "def"}
+        or {"rel_fname": ["src/a.py", "src/b.py"]}.
+        """
+
+        return self.batch_embed_search([query], top_n=top_n, filters=filters)[0]
+
+    def batch_embed_search(
+        self, queries: List[str], top_n: int = 3, filters: Dict[str, Any] = None
+    ) -> List[List[Dict[str, Any]]]:
+        """
+        `embed_search` for several queries: one encoder pass, one matrix product.
+
+        Unfiltered results are kept, so a later `embed_search` for the same query
+        and `top_n` is answered without encoding it again.
+        """
+
+        return [
+            [self.tags[i] for i in indices]
+            for indices in self._batch_embed_indices(queries, top_n, filters)
         ]
-        scores = self.bm25.get_scores(tokenized_query)
-        top_n_indices = np.argsort(scores)[-top_n:][::-1]
-        return [self.tags[i] for i in top_n_indices]
 
-    def embed_search(self, query: str, top_n: int = 3) -> List[Dict[str, Any]]:
+    def hybrid_search(
+        self, query: str, top_n: int = 5, filters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Tags ranked by reciprocal rank fusion of BM25 and embedding search.
+
+        Lexical hits on identifiers and semantic hits on code both count, so a
+        few fused results replace a long embedding-only list.
+        """
+
+        return self.batch_hybrid_search([query], top_n=top_n, filters=filters)[0]
+
+    def batch_hybrid_search(
+        self,
+        queries: List[str],
+        top_n: int = 5,
+        filters: Dict[str, Any] = None,
+        candidates: int = HYBRID_CANDIDATES,
+        rrf_k: int = 60,
+    ) -> List[List[Dict[str, Any]]]:
+
+        if not self.tags:
+            logging.warning("No tags available for hybrid search.")
+            return [[] for _ in queries]
+
+        candidates = max(candidates, top_n)
+        tag_mask = self._tag_filter_mask(filters)
+        dense_lists = self._batch_embed_indices(queries, candidates, filters)
+
+        results = []
+        for query, dense in zip(queries, dense_lists):
+            scores = self.bm25_index.get_scores(tokenize(query))
+            scores[~self.lexical_mask] = 0
+            if tag_mask is not None:
+                scores[~tag_mask] = 0
+            lexical = self.bm25_index.top_n(query, candidates, scores=scores)
+            lexical = [i for i in lexical.tolist() if scores[i] > 0]
+
+            fused = {}
+            for ranking in (lexical, dense):
+                for rank, i in enumerate(ranking):
+                    fused[i] = fused.get(i, 0.0) + 1.0 / (rrf_k + rank + 1)
+            ranked = sorted(fused, key=lambda i: (-fused[i], i))[:top_n]
+            results.append([self.tags[i] for i in ranked])
+        return results
+
+    def _batch_embed_indices(
+        self, queries: List[str], top_n: int, filters: Dict[str, Any] = None
+    ) -> List[List[int]]:
 
         if self.code_embeddings is None:
-            logging.info("Generating code embeddings for the first time...")
-            self.code_embeddings = self._generate_code_embeddings()
+            with self._build_lock:
+                if self.code_embeddings is None:
+                    logging.info("Loading code embeddings...")
+                    self.code_embeddings = self._generate_code_embeddings()
 
-        if len(self.code_embeddings) == 0:
+        if not self.row_to_tags:
             logging.error("No code embeddings available for search.")
-            return []
-
-        query_embedding = self.embedding_model.encode(query, convert_to_tensor=True)
-        similarities = util.pytorch_cos_sim(query_embedding, self.code_embeddings)
-        actual_top_n = min(top_n, similarities.size(1))
-        if actual_top_n == 0:
-            logging.error("No valid embeddings found to compare with.")
-            return []
+            return [[] for _ in queries]
+
+        cacheable = not filters
+        results = {}
+        pending = [
+            query
+            for query in dict.fromkeys(queries)
+            if not (cacheable and (query, top_n) in self.query_results)
+        ]
+        if pending:
+            # A row is searchable when at least one of the tags sharing it is allowed
+            tag_mask = self._tag_filter_mask(filters)
+            rows = self.tag_rows if tag_mask is None else self.tag_rows[tag_mask]
+            row_mask = np.zeros(len(self.vector_index), dtype=bool)
+            row_mask[rows[rows >= 0]] = True
+
+            query_embeddings = self.embedding_service.encode(pending)
+            top_rows_list = self.vector_index.search_batch(
+                query_embeddings, top_k=top_n, mask=row_mask
+            )
+            for query, (top_rows, _) in zip(pending, top_rows_list):
+                results[query] = self._rows_to_tag_indices(top_rows, tag_mask, top_n)
+                if cacheable:
+                    self.query_results[(query, top_n)] = results[query]
+
+        return [
+            results[query] if query in results else self.query_results[(query, top_n)]
+            for query in queries
+        ]
 
-        top_results = similarities.topk(actual_top_n)
-        return [self.tags[i] for i in top_results.indices.tolist()[0]]
+    def _rows_to_tag_indices(
+        self, top_rows: np.ndarray, tag_mask: np.ndarray, top_n: int
+    ) -> List[int]:
+
+        indices = []
+        for row in top_rows:
+            for i in self.row_to_tags[row]:
+                if len(indices) >= top_n:
+                    return indices
+                if tag_mask is None or tag_mask[i]:
+                    indices.append(i)
+        return indices
+
+    def _tag_filter_mask(self, filters: Dict[str, Any] = None) -> Union[np.ndarray, None]:
+
+        if not filters:
+            return None
+        if isinstance(self.tags, TagStore):
+            return self.tags.mask(**filters)
+        mask = None
+        for field, value in filters.items():
+            column = [tag.get(field) for tag in self.tags]
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            condition = np.isin(np.asarray(column, dtype=object), list(values))
+            mask = condition if mask is None else mask & condition
+        return mask
+
+    @staticmethod
+    def _embedding_text(details: str) -> Union[str, None]:
+        """
+        Text to embed for a tag's details, or None when there is nothing to embed.
+
+        Whitespace is collapsed, which the sentence-transformer tokenizer ignores
+        anyway, so the same call line at different indentation is embedded once.
+        """
+        text = " ".join((details or "").split())
+        if len(text) < 3 or text.lower() == "none" or not any(c.isalnum() for c in text):
+            return None
+        return text
+
+    def _generate_code_embeddings(self) -> EmbeddingIndex:
+
+        code_embeddings = EmbeddingIndex(
+            self.embeddings_dir, self.embedding_service.model_name
+        )
 
-    def _generate_code_embeddings(self):
+        text_ids = {}
+        tag_text_ids = np.full(len(self.tags), -1, dtype=np.int64)
+        for i, tag in enumerate(self.tags):
+            text = self._embedding_text(tag.get("details", ""))
+            if text is not None:
+                tag_text_ids[i] = text_ids.setdefault(text, len(text_ids))
+        logging.info(
+            f"{len(text_ids)} unique texts to embed for {len(self.tags)} tags "
+            f"({int((tag_text_ids < 0).sum())} placeholder tags skipped)"
+        )
 
-        code_texts = [tag.get("details", "") for tag in self.tags]
-        return self.embedding_model.encode(code_texts, convert_to_tensor=True)
+        text_rows = code_embeddings.rows_for(
+            list(text_ids), self.embedding_service.encode
+        )
+        embedded = tag_text_ids >= 0
+        self.tag_rows = np.full(len(self.tags), -1, dtype=np.int64)
+        self.tag_rows[embedded] = text_rows[tag_text_ids[embedded]]
+        self.row_to_tags = {}
+        for i, row in enumerate(self.tag_rows.tolist()):
+            if row >= 0:
+                self.row_to_tags.setdefault(row, []).append(i)
+
+        # The matrix rows follow this workspace's texts, so the clusters are too
+        self.vector_index = build_vector_index(
+            code_embeddings.matrix
+            if code_embeddings.matrix is not None
+            else np.zeros((0, 1), dtype=np.float32),
+            cache_file=self.judge_path / "embeddings_ivf.npz",
+            model=self.embedding_service.model_name,
+            texts=hashlib.sha256("".join(code_embeddings.keys).encode()).hexdigest(),
+        )
+        return code_embeddings
 
     def display(
         self,
@@ -254,7 +640,7 @@ class DevCodeSearch:
         self, tag: Dict[str, Any], theme="monokai"
     ) -> Union[Panel, None]:
 
-        start_line = tag["line_number"][0]
+        start_line = max(self._line_span(tag)[0], 1)
         syntax = Syntax(
             tag["details"],
             "python",
@@ -295,8 +681,9 @@ class DevCodeSearch:
         self, tag: Dict[str, Any], theme="monokai", context_lines: int = 5
     ) -> str:
 
-        start_line = max(tag["line_number"][0] - context_lines, 1)
-        end_line = tag["line_number"][1] + context_lines
+        first, last = self._line_span(tag)
+        start_line = max(first - context_lines, 1)
+        end_line = max(last, 1) + context_lines
         with open(tag["fname"], "r", encoding="utf-8") as file:
             code_lines = file.readlines()
         code_snippet = "".join(code_lines[start_line - 1 : end_line])
@@ -321,10 +708,20 @@ class DevCodeSearch:
             padding=(1, 2),
         ).renderable
 
+    @staticmethod
+    def _line_span(tag: Dict[str, Any]) -> tuple:
+        """(start, end) of a tag; a scalar line, e.g. -1 for placeholder tags, is both."""
+
+        line = tag["line_number"]
+        if isinstance(line, (list, tuple)):
+            return line[0], line[1]
+        return line, line
+
     def _generate_metadata(
         self, tag: Dict[str, Any], start_line: int = None, end_line: int = None
     ) -> Text:
 
+        # A span prints as [start, end], a placeholder tag's scalar line as is
         line_info = (
             f"{tag['line_number']}"
             if start_line is None or end_line is None
@@ -0,0 +1,149 @@
+import os
+import time
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# SQLite's default limit on the parameters of one statement is 999
+_QUERY_CHUNK = 900
+
+
+class EmbeddingIndex:
+    """
+    Persistent, content-addressed store of text embeddings.
+
+    Vectors are L2-normalised float32 blobs in a SQLite file
+    (`embeddings.sqlite`) keyed by the model name and a hash of the text, so
+    several workers and every workspace share it and a rebuilt or resubmitted
+    repository only encodes its new texts. When the stored vectors grow above
+    `max_bytes`, the least recently used ones are evicted.
+
+    `rows_for` loads the vectors of the requested texts into `matrix`, so a
+    search only covers the texts of the current workspace.
+    """
+
+    DB_FILE = "embeddings.sqlite"
+
+    def __init__(self, index_dir, model_name: str, max_bytes: int = None):
+        self.index_dir = Path(index_dir)
+        self.db_file = self.index_dir / self.DB_FILE
+        self.model_name = model_name
+        self.max_bytes = int(
+            max_bytes or os.getenv("EMBEDDING_CACHE_MAX_BYTES", 512 * 1024 * 1024)
+        )
+        self.keys = []
+        self.matrix = None
+        self._lock = threading.Lock()
+
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.db_file), timeout=30, check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings ("
+            "model TEXT NOT NULL, key TEXT NOT NULL, vector BLOB NOT NULL, "
+            "last_access REAL NOT NULL, PRIMARY KEY (model, key))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS embeddings_last_access ON embeddings (last_access)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def content_key(text: str) -> str:
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+    def rows_for(self, texts: List[str], encode) -> np.ndarray:
+        """
+        Row of `matrix` for each text, encoding and storing missing ones.
+
+        `encode` maps a list of texts to an (n, dim) array. `matrix` then holds
+        one row per distinct text, in order of first occurrence.
+        """
+        keys = [self.content_key(text) for text in texts]
+        key_to_row = {}
+        unique_texts = {}
+        for key, text in zip(keys, texts):
+            if key not in key_to_row:
+                key_to_row[key] = len(key_to_row)
+                unique_texts[key] = text
+
+        with self._lock:
+            vectors = self._fetch(list(key_to_row))
+            missing = [key for key in key_to_row if key not in vectors]
+            if missing:
+                logging.info(
+                    f"Encoding {len(missing)} new texts ({len(vectors)} already stored)..."
+                )
+                encoded = self._normalize(encode([unique_texts[key] for key in missing]))
+                vectors.update(zip(missing, encoded))
+                self._store(missing, encoded)
+            self._conn.commit()
+
+        self.keys = list(key_to_row)
+        if self.keys:
+            self.matrix = np.stack([vectors[key] for key in self.keys])
+        else:
+            self.matrix = None
+        return np.array([key_to_row[key] for key in keys], dtype=np.int64)
+
+    @staticmethod
+    def _normalize(embeddings) -> np.ndarray:
+        embeddings = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(embeddings, axis=1, keepdims=True)
+        return embeddings / np.maximum(norms, 1e-12)
+
+    def _fetch(self, keys: List[str]) -> dict:
+        """Stored vectors of `keys`, marking them as just used."""
+        vectors = {}
+        now = time.time()
+        for start in range(0, len(keys), _QUERY_CHUNK):
+            chunk = keys[start : start + _QUERY_CHUNK]
+            placeholders = ",".join("?" * len(chunk))
+            for key, blob in self._conn.execute(
+                f"SELECT key, vector FROM embeddings WHERE model = ? AND key IN ({placeholders})",
+                (self.model_name, *chunk),
+            ):
+                vectors[key] = np.frombuffer(blob, dtype=np.float32)
+            self._conn.execute(
+                f"UPDATE embeddings SET last_access = ? WHERE model = ? AND key IN ({placeholders})",
+                (now, self.model_name, *chunk),
+            )
+        return vectors
+
+    def _store(self, keys: List[str], embeddings: np.ndarray):
+        now = time.time()
+        self._conn.executemany(
+            "INSERT OR REPLACE INTO embeddings (model, key, vector, last_access) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                (self.model_name, key, vector.tobytes(), now)
+                for key, vector in zip(keys, embeddings)
+            ),
+        )
+        self._evict()
+
+    def _evict(self):
+        total = self._conn.execute(
+            "SELECT COALESCE(SUM(LENGTH(vector)), 0) FROM embeddings"
+        ).fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        evicted = []
+        for model, key, size in self._conn.execute(
+            "SELECT model, key, LENGTH(vector) FROM embeddings ORDER BY last_access ASC"
+        ).fetchall():
+            if total <= self.max_bytes:
+                break
+            evicted.append((model, key))
+            total -= size
+        self._conn.executemany(
+            "DELETE FROM embeddings WHERE model = ? AND key = ?", evicted
+        )
+        logging.info(f"Evicted {len(evicted)} vectors from the embedding index.")
@@ -3,12 +3,13 @@ import re
 import ast
 import json
 import pickle
+import multiprocessing
 
 import builtins
 import networkx as nx
 
-from copy import deepcopy
-from collections import namedtuple
+from collections import namedtuple, defaultdict, Counter
+from functools import lru_cache
 from pathlib import Path
 from dotenv import load_dotenv
 from matplotlib import pyplot as plt
@@ -20,10 +21,99 @@ from pygments.token import Token
 from pygments.util import ClassNotFound
 from tree_sitter_languages import get_language, get_parser
 from grep_ast import TreeContext
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor
+
+from agent_as_a_judge.module.graph_manifest import GraphManifest
+from agent_as_a_judge.module.tag_store import TagStore
 
 Tag = namedtuple("Tag", "rel_fname fname line name identifier category details".split())
 
+ParsedFile = namedtuple(
+    "ParsedFile", "rel_fname fname text source line_offsets tree structure".split()
+)
+
+CODE_EXTENSIONS = (".py", ".tsx", ".ts", ".cs")
+
+BUILTIN_NAMES = frozenset(
+    dir(builtins) + dir(list) + dir(dict) + dir(set) + dir(str) + dir(tuple)
+)
+
+TAG_QUERY_SCM = {
+    "python": """
+        (class_definition
+        name: (identifier) @name.definition.class) @definition.class
+
+        (function_definition
+        name: (identifier) @name.definition.function) @definition.function
+
+        (call
+        function: [
+            (identifier) @name.reference.call
+            (attribute
+                attribute: (identifier) @name.reference.call)
+        ]) @reference.call
+        """,
+    "typescript": """
+        (class_declaration
+            (type_identifier) @definition.class)
+
+        (lexical_declaration
+            (variable_declarator
+                (identifier) @definition.function))
+
+        (call_expression
+            (identifier) @reference.call)
+        """,
+    "c_sharp": """
+        (class_declaration
+            (identifier) @definition.class)
+
+        (method_declaration
+            (identifier) @definition.function)
+
+        (constructor_declaration
+            (identifier) @definition.function)
+
+        (local_declaration_statement) @reference.call
+
+        (expression_statement) @reference.call
+
+        (return_statement) @reference.call
+        """,
+}
+
+
+@lru_cache(maxsize=None)
+def get_tag_query(lang):
+    """Compile the tag query of a language once per process."""
+    if lang not in TAG_QUERY_SCM:
+        return None
+    return get_language(lang).query(TAG_QUERY_SCM[lang])
+
+
+_worker_graph = None
+
+
+def _parse_context():
+    """
+    Start method for the parse pool. Not fork: the judge parses while other
+    threads run, and a forked child can inherit their locks held. The fork
+    server imports this module once, so workers start without re-importing it.
+    """
+    if "forkserver" not in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("spawn")
+    context = multiprocessing.get_context("forkserver")
+    context.set_forkserver_preload([__name__])
+    return context
+
+
+def _parse_file_worker(filepath, relative_filepath):
+    """Process-pool entry point: parse one file into its structure and tags."""
+    global _worker_graph
+    if _worker_graph is None:
+        _worker_graph = DevGraph()
+    return _worker_graph.parse_file(filepath, relative_filepath)
+
 
 class DevGraph:
 
@@ -35,6 +125,8 @@ class DevGraph:
         include_dirs=None,
         exclude_dirs=None,
         exclude_files=None,
+        cache_dir=None,
+        max_workers=None,
     ):
         self.io = io
         self.verbose = verbose
@@ -42,10 +134,22 @@ class DevGraph:
         self.include_dirs = include_dirs
         self.exclude_dirs = exclude_dirs or ["__pycache__", "env", "venv"]
         self.exclude_files = exclude_files or [".DS_Store"]
-        self.structure = self.create_structure(self.root)
+        self.manifest = GraphManifest(cache_dir) if cache_dir else None
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.file_keys = {}
+        self.parsed_files = {}
+        self.file_structures = {}
+        self._structure = None
         self.warned_files = set()
         self.tree_cache = {}
 
+    @property
+    def structure(self):
+        # Built on first use, so DevGraph can also serve plain file listings cheaply
+        if self._structure is None:
+            self._structure = self.create_structure(self.root)
+        return self._structure
+
     def build(self, filepaths, mentioned=None):
         if not filepaths:
             return None, None
@@ -54,6 +158,9 @@ class DevGraph:
         tags = self._get_tags_from_files(filepaths, mentioned)
         dev_graph = self._tags_to_graph(tags)
 
+        if self.manifest is not None:
+            self.manifest.save()
+
         return tags, dev_graph
 
     def _get_tags_from_files(self, filepaths, mentioned=None):
@@ -61,17 +168,15 @@ class DevGraph:
             tags_of_files = []
             filepaths = sorted(set(filepaths))
 
-            with ThreadPoolExecutor() as executor:
-                future_to_filepath = {
-                    executor.submit(self._process_file, filepath): filepath
-                    for filepath in filepaths
-                }
-
-                for future in as_completed(future_to_filepath):
-                    tags = future.result()
-                    if tags:
-                        tags_of_files.extend(tags)
-                        
+            # Every code file is parsed once while building the structure; reuse those tags
+            self.structure
+            for filepath in filepaths:
+                if not self._is_valid_file(filepath):
+                    continue
+                parsed = self.parsed_files.get(os.path.normpath(filepath))
+                if parsed:
+                    tags_of_files.extend(parsed[1])
+
             return tags_of_files
 
         except RecursionError:
@@ -112,7 +217,25 @@ class DevGraph:
         if file_mtime is None:
             return []
 
-        return list(self._get_tags_raw(filepath, relative_filepath))
+        key = self._file_key(filepath)
+        cached = self.manifest.get(key, "tags") if key else None
+        if cached is not None:
+            return [Tag(relative_filepath, filepath, *fields) for fields in cached]
+
+        tags = list(self._get_tags_raw(filepath, relative_filepath))
+        if key:
+            self.manifest.put(key, "tags", [tuple(tag[2:]) for tag in tags])
+        return tags
+
+    def _file_key(self, filepath):
+        if self.manifest is None:
+            return None
+        if filepath not in self.file_keys:
+            try:
+                self.file_keys[filepath] = self.manifest.file_key(filepath)
+            except OSError:
+                self.file_keys[filepath] = None
+        return self.file_keys[filepath]
 
     def _get_modified_time(self, fname):
         try:
@@ -120,12 +243,58 @@ class DevGraph:
         except FileNotFoundError:
             self.io.tool_error(f"File not found error: {fname}")
 
-    def _get_tags_raw(self, filepath, relative_filepath):
+    def load_file(self, filepath, relative_filepath):
+        """
+        Read a code file and build its tree-sitter tree once.
 
-        relative_filepath_list = relative_filepath.split(os.sep)
-        s = self._navigate_structure(relative_filepath_list)
-        if s is None:
-            return
+        The returned ParsedFile (source bytes, line offsets and tree) is shared by
+        the structure and the tag extraction, so neither re-reads nor re-parses it.
+        """
+        try:
+            with open(filepath, "r", encoding="utf-8") as f:
+                text = f.read().replace("\ufeff", "")
+        except Exception as e:
+            print(f"Error in file {filepath}: {e}")
+            return None
+
+        source = bytes(text, "utf-8")
+        line_offsets = [0] + [match.end() for match in re.finditer(b"\n", source)]
+
+        tree_lang = self.filename_to_tree_lang(filepath)
+        tree = get_parser(tree_lang).parse(source) if tree_lang else None
+
+        return ParsedFile(
+            rel_fname=relative_filepath,
+            fname=filepath,
+            text=text,
+            source=source,
+            line_offsets=line_offsets,
+            tree=tree,
+            structure=None,
+        )
+
+    @staticmethod
+    def _source_line(parsed, row):
+        start = parsed.line_offsets[row]
+        end = (
+            parsed.line_offsets[row + 1]
+            if row + 1 < len(parsed.line_offsets)
+            else len(parsed.source)
+        )
+        return parsed.source[start:end].decode("utf-8")
+
+    def _get_tags_raw(self, filepath, relative_filepath, parsed=None):
+
+        if parsed is None:
+            relative_filepath_list = relative_filepath.split(os.sep)
+            s = self._navigate_structure(relative_filepath_list)
+            if s is None:
+                return
+            parsed = self.load_file(filepath, relative_filepath)
+            if parsed is None:
+                return
+        else:
+            s = parsed.structure
         
         structure_classes, structure_all_funcs = self._extract_structure_info(s)
         
@@ -133,15 +302,11 @@ class DevGraph:
         if not lang:
             return
 
-        language = get_language(lang)
-        parser = get_parser(lang)
-        parser.set_language(language)
-
-        code, codelines = self._read_code(filepath)
+        code = parsed.text
         if not code:
             return
 
-        tree = parser.parse(bytes(code, "utf-8"))
+        tree = parsed.tree
         
         std_funcs, std_libs = [], []
         if lang == 'python':
@@ -150,61 +315,11 @@ class DevGraph:
             except Exception:
                 pass
 
-        builtins_funs = [name for name in dir(builtins)]
-        builtins_funs += dir(list)
-        builtins_funs += dir(dict)
-        builtins_funs += dir(set)
-        builtins_funs += dir(str)
-        builtins_funs += dir(tuple)
+        builtins_funs = BUILTIN_NAMES
 
-        if lang == 'python':
-            query_scm = """
-            (class_definition
-            name: (identifier) @name.definition.class) @definition.class
-
-            (function_definition
-            name: (identifier) @name.definition.function) @definition.function
-
-            (call
-            function: [
-                (identifier) @name.reference.call
-                (attribute
-                    attribute: (identifier) @name.reference.call)
-            ]) @reference.call
-            """
-        elif lang == 'typescript':
-            query_scm = """
-            (class_declaration
-                (type_identifier) @definition.class)
-
-            (lexical_declaration
-                (variable_declarator
-                    (identifier) @definition.function))
-
-            (call_expression
-                (identifier) @reference.call)
-            """
-        elif lang == 'c_sharp':
-            query_scm = """
-            (class_declaration
-                (identifier) @definition.class)
-
-            (method_declaration
-                (identifier) @definition.function)
-
-            (constructor_declaration
-                (identifier) @definition.function)
-
-            (local_declaration_statement) @reference.call
-
-            (expression_statement) @reference.call
-
-            (return_statement) @reference.call
-            """
-        else:
+        query = get_tag_query(lang)
+        if query is None:
             return
-
-        query = language.query(query_scm)
         captures = query.captures(tree.root_node)
 
         saw = set() 
@@ -237,7 +352,7 @@ class DevGraph:
 
             saw.add(identifier)
 
-            cur_cdl = codelines[node.start_point[0]] 
+            cur_cdl = self._source_line(parsed, node.start_point[0])
             
             if lang == 'python':
                 category = "class" if "class " in cur_cdl else "function"
@@ -327,13 +442,16 @@ class DevGraph:
         if "ref" in saw or "def" not in saw:
             return 
 
-        yield from self._process_additional_tokens(
-            filepath, relative_filepath, codelines
-        )
+        yield from self._process_additional_tokens(filepath, relative_filepath, code)
 
     def _navigate_structure(self, relative_filepath_list):
+        # The structure is shared read-only: return the file's own entry, never a copy
+        structure = self.structure
+        s = self.file_structures.get(os.path.join(*relative_filepath_list))
+        if s is not None:
+            return s
 
-        s = deepcopy(self.structure)
+        s = structure
         for fname_part in relative_filepath_list:
             s = s.get(fname_part)
             if s is None:
@@ -363,24 +481,13 @@ class DevGraph:
         else:
             return None
 
-    def _read_code(self, filepath):
+    def filename_to_tree_lang(self, filename):
+        """Grammar used to parse the file (covers .tsx, which has no tag query)."""
+        if filename.endswith((".ts", ".tsx")):
+            return "typescript"
+        return self.filename_to_lang(filename)
 
-        with open(filepath, "r", encoding="utf-8") as f:
-            code = f.read()
-
-        code = code.replace("\ufeff", "") 
-
-        if not code:
-            return "", []
-
-        with open(str(filepath), "r", encoding="utf-8") as f:
-            codelines = f.readlines()
-
-        return code, codelines
-
-    def _process_additional_tokens(self, filepath, relative_filepath, codelines):
-
-        code = "\n".join(codelines)
+    def _process_additional_tokens(self, filepath, relative_filepath, code):
 
         try:
             lexer = guess_lexer_for_filename(filepath, code)
@@ -424,15 +531,32 @@ class DevGraph:
     def _add_class_edges(self, G, tag):
         class_funcs = tag.details.split("\n")
         for f in class_funcs:
-            G.add_edge(tag.name, f.strip())
+            self._add_weighted_edge(G, tag.name, f.strip())
 
     def _add_reference_edges(self, G, tags):
-        tags_ref = [tag for tag in tags if tag.identifier == "ref"]
-        tags_def = [tag for tag in tags if tag.identifier == "def"]
-        for tag_ref in tags_ref:
-            for tag_def in tags_def:
-                if tag_ref.name == tag_def.name:
-                    G.add_edge(tag_ref.name, tag_def.name)
+        # Hash index name -> definitions, so each ref is matched in O(1) instead of
+        # scanning every def; a ref links to every def that shares its name
+        defs_by_name = defaultdict(list)
+        for tag in tags:
+            if tag.identifier == "def":
+                defs_by_name[tag.name].append(tag)
+
+        ref_counts = Counter(
+            tag.name
+            for tag in tags
+            if tag.identifier == "ref" and tag.name in defs_by_name
+        )
+        for name, ref_count in ref_counts.items():
+            for tag_def in defs_by_name[name]:
+                self._add_weighted_edge(G, name, tag_def.name, ref_count)
+
+    @staticmethod
+    def _add_weighted_edge(G, u, v, weight=1):
+        """Store repeated links as one edge whose `weight` counts them."""
+        if G.has_edge(u, v, key=0):
+            G.edges[u, v, 0]["weight"] += weight
+        else:
+            G.add_edge(u, v, key=0, weight=weight)
 
     def split_path(self, path):
         path = os.path.relpath(path, self.root)
@@ -441,10 +565,8 @@ class DevGraph:
     def create_structure(self, directory_path):
         structure = {}
         main_file_set = set(self.list_all_files(directory_path))
-        num_files = len(list(os.walk(directory_path)))
-        for root, _, files in tqdm(
-            os.walk(directory_path), total=num_files, desc="Parsing files"
-        ):
+        code_files = []
+        for root, _, files in os.walk(directory_path):
             relative_root = os.path.relpath(root, directory_path)
             current_structure = structure
 
@@ -458,37 +580,113 @@ class DevGraph:
                 filepath = os.path.join(root, filename)
                 if filepath not in main_file_set:
                     continue
-                if filename.endswith(".py"):
-                    class_info, function_names, code_lines = self.parse_python_file(
-                        filepath
-                    )
-                    current_structure[filename] = {
-                        "classes": class_info,
-                        "functions": function_names,
-                        "code": code_lines,
-                    }
-                elif filename.endswith(".tsx") or filename.endswith(".ts"):
-                    class_info, function_names, code_lines = self.parse_typescript_file(
-                        filepath
+                # Filled in after parsing; inserting now keeps the directory order
+                current_structure[filename] = {}
+                self.file_structures[os.path.relpath(filepath, directory_path)] = (
+                    current_structure[filename]
+                )
+                if filename.endswith(CODE_EXTENSIONS):
+                    code_files.append((current_structure, filename, filepath))
+
+        parsed = self.parse_files(
+            [filepath for _, _, filepath in code_files], root=directory_path
+        )
+        for current_structure, filename, filepath in code_files:
+            file_structure = parsed[os.path.normpath(filepath)][0]
+            current_structure[filename] = file_structure
+            self.file_structures[os.path.relpath(filepath, directory_path)] = (
+                file_structure
+            )
+
+        return structure
+
+    def parse_files(self, filepaths, root=None):
+        """
+        Parse each code file once into its structure and tags.
+
+        Files already in the manifest are reused; the rest are spread over a process
+        pool. Results come back in input order, keyed by normalised file path.
+        """
+        root = root or self.root
+        results = {}
+        pending = []
+        for filepath in filepaths:
+            relative_filepath = os.path.relpath(filepath, root)
+            key = self._file_key(filepath)
+            if key:
+                cached_structure = self.manifest.get(key, "structure")
+                cached_tags = self.manifest.get(key, "tags")
+                if cached_structure is not None and cached_tags is not None:
+                    results[os.path.normpath(filepath)] = (
+                        cached_structure,
+                        [Tag(relative_filepath, filepath, *fields) for fields in cached_tags],
                     )
-                    current_structure[filename] = {
-                        "classes": class_info,
-                        "functions": function_names,
-                        "code": code_lines,
-                    }
-                elif filename.endswith(".cs"):
-                    class_info, function_names, code_lines = self.parse_csharp_file(
-                        filepath
+                    continue
+            pending.append((filepath, relative_filepath))
+
+        if self.max_workers > 1 and len(pending) > 1:
+            chunksize = max(1, len(pending) // (self.max_workers * 4))
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=_parse_context()
+            ) as executor:
+                parsed = list(
+                    tqdm(
+                        executor.map(
+                            _parse_file_worker,
+                            [filepath for filepath, _ in pending],
+                            [relative_filepath for _, relative_filepath in pending],
+                            chunksize=chunksize,
+                        ),
+                        total=len(pending),
+                        desc="Parsing files",
                     )
-                    current_structure[filename] = {
-                        "classes": class_info,
-                        "functions": function_names,
-                        "code": code_lines,
-                    }
-                else:
-                    current_structure[filename] = {}
+                )
+        else:
+            parsed = [
+                self.parse_file(filepath, relative_filepath)
+                for filepath, relative_filepath in tqdm(pending, desc="Parsing files")
+            ]
 
-        return structure
+        for (filepath, _), (file_structure, tags) in zip(pending, parsed):
+            results[os.path.normpath(filepath)] = (file_structure, tags)
+            key = self._file_key(filepath)
+            if key:
+                self.manifest.put(key, "structure", file_structure)
+                # fname/rel_fname are dropped so the entry is reusable at another path
+                self.manifest.put(key, "tags", [tuple(tag[2:]) for tag in tags])
+
+        self.parsed_files.update(results)
+        return results
+
+    def parse_file(self, filepath, relative_filepath):
+        parsed = self.load_file(filepath, relative_filepath)
+        if parsed is None:
+            return {"classes": [], "functions": [], "code": ""}, []
+
+        parsed = parsed._replace(structure=self._parse_file_structure(parsed))
+        tags = list(self._get_tags_raw(filepath, relative_filepath, parsed))
+        return parsed.structure, tags
+
+    def _parse_file_structure(self, parsed):
+        filepath = parsed.fname
+        if filepath.endswith(".py"):
+            class_info, function_names, code_lines = self.parse_python_file(
+                filepath, parsed.text
+            )
+        elif filepath.endswith(".tsx") or filepath.endswith(".ts"):
+            class_info, function_names, code_lines = self.parse_typescript_file(
+                filepath, parsed.text, parsed.tree
+            )
+        else:
+            class_info, function_names, code_lines = self.parse_csharp_file(
+                filepath, parsed.text, parsed.tree
+            )
+
+        return {
+            "classes": class_info,
+            "functions": function_names,
+            "code": code_lines,
+        }
 
     def parse_python_file(self, file_path, file_content=None):
         if file_content is None:
@@ -506,6 +704,7 @@ class DevGraph:
                 print(f"Error in file {file_path}: {e}")
                 return [], [], ""
 
+        code_lines = file_content.splitlines()
         class_info = []
         function_names = []
         class_methods = set()
@@ -520,9 +719,7 @@ class DevGraph:
                                 "name": n.name,
                                 "start_line": n.lineno,
                                 "end_line": n.end_lineno,
-                                "text": file_content.splitlines()[
-                                    n.lineno - 1 : n.end_lineno
-                                ],
+                                "text": code_lines[n.lineno - 1 : n.end_lineno],
                             }
                         )
                         class_methods.add(n.name)
@@ -531,9 +728,7 @@ class DevGraph:
                         "name": node.name,
                         "start_line": node.lineno,
                         "end_line": node.end_lineno,
-                        "text": file_content.splitlines()[
-                            node.lineno - 1 : node.end_lineno
-                        ],
+                        "text": code_lines[node.lineno - 1 : node.end_lineno],
                         "methods": methods,
                     }
                 )
@@ -546,14 +741,12 @@ class DevGraph:
                             "name": node.name,
                             "start_line": node.lineno,
                             "end_line": node.end_lineno,
-                            "text": file_content.splitlines()[
-                                node.lineno - 1 : node.end_lineno
-                            ],
+                            "text": code_lines[node.lineno - 1 : node.end_lineno],
                         }
                     )
-        return class_info, function_names, file_content.splitlines()
+        return class_info, function_names, code_lines
 
-    def parse_typescript_file(self, file_path, file_content=None):
+    def parse_typescript_file(self, file_path, file_content=None, tree=None):
         if file_content is None:
             try:
                 with open(file_path, "r", encoding='utf-8') as file:
@@ -564,23 +757,14 @@ class DevGraph:
                 return [], [], ""
         code_lines = file_content.splitlines()
 
-        language = get_language('typescript')
-        parser = get_parser('typescript')
-        parser.set_language(language)
-
-        tree = parser.parse(bytes(file_content, 'utf-8'))
+        if tree is None:
+            tree = get_parser('typescript').parse(bytes(file_content, 'utf-8'))
         
         class_info = []
         function_names = []
         class_methods = set()
 
         root_node = tree.root_node
-
-        def check(root, depth):
-            if root.children:
-                for item in root.children:
-                    check(item, depth+1)
-        check(root_node, 0)
         
         def traverse(node):
             if node.type == 'class_declaration':
@@ -589,7 +773,7 @@ class DevGraph:
 
                 for child in node.children:
                     if child.type == 'type_identifier':
-                        class_name = file_content[child.start_byte:child.end_byte]
+                        class_name = child.text.decode('utf-8')
                         break
 
                 body_node = None
@@ -605,7 +789,7 @@ class DevGraph:
                                 func_name = None
                                 for func_child in item.children:
                                     if func_child.type == 'property_identifier':
-                                        func_name = file_content[func_child.start_byte:func_child.end_byte]
+                                        func_name = func_child.text.decode('utf-8')
                                         break
                                 if func_name:
                                     methods.append(
@@ -637,10 +821,10 @@ class DevGraph:
                     if child.type == 'variable_declarator':
                         for child_2 in child.children:
                             if child_2.type == 'identifier':
-                                func_name = file_content[child_2.start_byte:child_2.end_byte]
+                                func_name = child_2.text.decode('utf-8')
                                 break
                     if child.type == 'simple_identifier':
-                        func_name = file_content[child.start_byte:child.end_byte]
+                        func_name = child.text.decode('utf-8')
                         break
                 if func_name and func_name not in class_methods:
                     function_names.append(
@@ -658,36 +842,27 @@ class DevGraph:
         
         return class_info, function_names, code_lines
 
-    def parse_csharp_file(self, file_path, file_content=None):
+    def parse_csharp_file(self, file_path, file_content=None, tree=None):
         if file_content is None:
             try:
                 with open(file_path, "r", encoding='utf-8') as file:
                     file_content = file.read()
                     file_content = file_content.replace("\ufeff", "") 
-                    file_content = re.sub(r'//.*', '', file_content)
             except Exception as e:
                 print(f"Error in file {file_path}: {e}")
                 return [], [], ""
-        code_lines = file_content.splitlines()
+        # Comments are only dropped from the stored text; the tree (shared with the
+        # tag extraction) parses them as separate nodes, and line numbers stay aligned
+        code_lines = re.sub(r'//.*', '', file_content).splitlines()
 
-        language = get_language('c_sharp')
-        parser = get_parser('c_sharp')
-        parser.set_language(language)
-        
-        tree = parser.parse(bytes(file_content, 'utf-8'))
+        if tree is None:
+            tree = get_parser('c_sharp').parse(bytes(file_content, 'utf-8'))
         
         class_info = []
         function_names = []
         class_methods = set()
 
         root_node = tree.root_node
-
-        
-        def check(root, depth):
-            if root.children:
-                for item in root.children:
-                    check(item, depth+1)
-        check(root_node, 0)
         
         def traverse(node):
             if node.type == 'class_declaration':
@@ -696,7 +871,7 @@ class DevGraph:
 
                 for child in node.children:
                     if child.type == 'identifier':
-                        class_name = file_content[child.start_byte:child.end_byte]
+                        class_name = child.text.decode('utf-8')
                         break
 
                 body_node = None
@@ -712,7 +887,7 @@ class DevGraph:
                                 func_name = None
                                 for func_child in item.children:
                                     if func_child.type == 'identifier':
-                                        func_name = file_content[func_child.start_byte:func_child.end_byte]
+                                        func_name = func_child.text.decode('utf-8')
                                         break
                                 if func_name:
                                     methods.append(
@@ -958,25 +1133,7 @@ if __name__ == "__main__":
         workspace_path, os.path.join(judge_path, "tree_structure.json")
     )
 
-    tags_data = []
-    for tag in tags:
-        tags_data.append(
-            {
-                "file_path": tag.fname,
-                "relative_file_path": tag.rel_fname,
-                "line_number": tag.line,
-                "name": tag.name,
-                "identifier": tag.identifier,
-                "category": tag.category,
-                "details": tag.details,
-            }
-        )
-
-    with open(os.path.join(judge_path, "tags.json"), "w") as f:
-        json.dump(tags_data, f, indent=4)
-        json_data = json.dumps(tags_data, indent=4)
-        with open(os.path.join(judge_path, "tags.json"), "w") as f:
-            f.write(json_data)
+    TagStore.write(judge_path, tags)
 
     pos = nx.spring_layout(G)
     labels = {}
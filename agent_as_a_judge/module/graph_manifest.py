@@ -0,0 +1,123 @@
+import os
+import time
+import pickle
+import sqlite3
+import hashlib
+import logging
+import threading
+from pathlib import Path
+
+# SQLite's default limit on the parameters of one statement is 999
+_QUERY_CHUNK = 900
+
+
+class GraphManifest:
+    """
+    Persistent per-file parse results for DevGraph, keyed by file content hash.
+
+    Each entry holds the parsed structure and the tags of one file version, so a
+    rebuild only re-parses files whose content is new. Entries are rows of a
+    SQLite file (`manifest.sqlite`) under `cache_dir`, read one file at a time
+    and written in one transaction on save, so both scale with the files a build
+    touches. Beyond `max_entries` files, the least recently used are evicted.
+    """
+
+    DB_FILE = "manifest.sqlite"
+
+    def __init__(self, cache_dir: Path, max_entries: int = 100000):
+        self.cache_dir = Path(cache_dir)
+        self.manifest_file = self.cache_dir / self.DB_FILE
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._pending = {}
+        self._used = set()
+        self._lock = threading.Lock()
+
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(
+            str(self.manifest_file), timeout=30, check_same_thread=False
+        )
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "key TEXT NOT NULL, field TEXT NOT NULL, value BLOB NOT NULL, "
+            "last_used REAL NOT NULL, PRIMARY KEY (key, field))"
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS entries_last_used ON entries (last_used)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def file_key(filepath: str) -> str:
+        """Content hash of the file, suffixed with its extension (it selects the parser)."""
+        digest = hashlib.sha256()
+        with open(filepath, "rb") as f:
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                digest.update(chunk)
+        return digest.hexdigest() + os.path.splitext(filepath)[1]
+
+    def get(self, key: str, field: str):
+        with self._lock:
+            value = self._pending.get((key, field))
+            if value is None:
+                row = self._conn.execute(
+                    "SELECT value FROM entries WHERE key = ? AND field = ?",
+                    (key, field),
+                ).fetchone()
+                if row is not None:
+                    try:
+                        value = pickle.loads(row[0])
+                    except Exception as e:
+                        logging.warning(f"Dropping unreadable graph manifest entry {key}: {e}")
+            if value is None:
+                self.misses += 1
+                return None
+            self._used.add(key)
+            self.hits += 1
+        return value
+
+    def put(self, key: str, field: str, value):
+        with self._lock:
+            self._pending[(key, field)] = value
+
+    def save(self):
+        with self._lock:
+            now = time.time()
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO entries (key, field, value, last_used) "
+                "VALUES (?, ?, ?, ?)",
+                (
+                    (key, field, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL), now)
+                    for (key, field), value in self._pending.items()
+                ),
+            )
+            used = list(self._used)
+            for start in range(0, len(used), _QUERY_CHUNK):
+                chunk = used[start : start + _QUERY_CHUNK]
+                self._conn.execute(
+                    f"UPDATE entries SET last_used = ? WHERE key IN ({','.join('?' * len(chunk))})",
+                    (now, *chunk),
+                )
+            written = len(self._pending)
+            self._pending.clear()
+            self._used.clear()
+            self._evict()
+            self._conn.commit()
+        logging.info(
+            f"Graph manifest saved: {written} new entries, {self.hits} hits, {self.misses} misses"
+        )
+
+    def _evict(self):
+        excess = (
+            self._conn.execute("SELECT COUNT(DISTINCT key) FROM entries").fetchone()[0]
+            - self.max_entries
+        )
+        if excess <= 0:
+            return
+        self._conn.execute(
+            "DELETE FROM entries WHERE key IN ("
+            "SELECT key FROM entries GROUP BY key ORDER BY MAX(last_used) LIMIT ?)",
+            (excess,),
+        )
+        logging.info(f"Evicted {excess} files from the graph manifest.")
@@ -8,7 +8,6 @@ import inspect
 import builtins
 import networkx as nx
 
-from copy import deepcopy
 from collections import namedtuple
 from pathlib import Path
 from dotenv import load_dotenv
@@ -43,6 +42,7 @@ class DevGraph:
         self.include_dirs = include_dirs
         self.exclude_dirs = exclude_dirs or ["__pycache__", "env", "venv"]
         self.exclude_files = exclude_files or [".DS_Store"]
+        self.file_structures = {}
         self.structure = self.create_structure(self.root)
         self.warned_files = set()
         self.tree_cache = {}
@@ -253,7 +253,12 @@ class DevGraph:
         )
 
     def _navigate_structure(self, relative_filepath_list):
-        s = deepcopy(self.structure)
+        # The structure is shared read-only: return the file's own entry, never a copy
+        s = self.file_structures.get(os.path.join(*relative_filepath_list))
+        if s is not None:
+            return s
+
+        s = self.structure
         for fname_part in relative_filepath_list:
             s = s.get(fname_part)
             if s is None:
@@ -661,6 +666,9 @@ class DevGraph:
                     }
                 else:
                     current_structure[filename] = {}
+                self.file_structures[
+                    os.path.normpath(os.path.join(relative_root, filename))
+                ] = current_structure[filename]
 
         return structure
 
@@ -1,8 +1,10 @@
 import os
+import re
 import time
 import warnings
 import logging
 from dotenv import load_dotenv
+from typing import Dict, List, Tuple
 from rich.logging import RichHandler
 from agent_as_a_judge.llm.provider import LLM
 from agent_as_a_judge.module.prompt.system_prompt_locate import get_system_prompt_locate
@@ -16,6 +18,37 @@ logging.basicConfig(
 )
 
 
+# A path or file name with an extension, or a dotfile: `src/db.py`, README.md, .gitignore
+NAMED_FILE_RE = re.compile(
+    r"(?<![\w@/.-])((?:[\w.-]+/)*(?:\.[A-Za-z0-9_][\w.-]*|[\w-][\w.-]*\.[A-Za-z0-9]{1,10}))(?![\w/-])"
+)
+KNOWN_FILENAMES = (
+    "Dockerfile",
+    "Makefile",
+    "LICENSE",
+    "Jenkinsfile",
+    "Procfile",
+    "Gemfile",
+    "Vagrantfile",
+    "CODEOWNERS",
+)
+KNOWN_FILENAME_RE = re.compile(r"\b(" + "|".join(KNOWN_FILENAMES) + r")\b")
+# Bare ".name" tokens that are dotfiles; others, like .NET or .csv, are technologies or formats
+KNOWN_DOTFILES = {
+    ".gitignore", ".gitattributes", ".gitmodules", ".gitlab-ci.yml", ".travis.yml",
+    ".editorconfig", ".env", ".env.example", ".env.local", ".dockerignore",
+    ".eslintrc", ".eslintrc.js", ".eslintrc.json", ".eslintignore", ".prettierrc",
+    ".prettierrc.json", ".prettierignore", ".stylelintrc", ".browserslistrc",
+    ".babelrc", ".npmrc", ".nvmrc", ".yarnrc", ".flake8", ".pylintrc", ".coveragerc",
+    ".pre-commit-config.yaml", ".python-version", ".ruby-version", ".tool-versions",
+}
+# Extensions common enough in criteria to report a missing file as evidence
+REPORTED_EXTENSIONS = {
+    ".md", ".txt", ".rst", ".yml", ".yaml", ".json", ".toml", ".ini", ".cfg",
+    ".xml", ".lock", ".env", ".py", ".cs", ".ts", ".sql", ".sln", ".csproj", ".props",
+}
+
+
 class DevLocate:
     def __init__(self):
         self.llm = self._initialize_llm()
@@ -47,6 +80,75 @@ class DevLocate:
             "llm_stats": llm_stats,
         }
 
+    @staticmethod
+    def match_named_files(
+        criteria: str, workspace: str, tree_structure: Dict[str, Dict[str, None]]
+    ) -> Tuple[List[str], List[str]]:
+        """
+        Workspace files the criteria names explicitly, and the named files not found.
+
+        Found files are paths relative to the workspace root. A bare name matches
+        its shallowest occurrences, a path matches by suffix. The structure skips
+        dotfiles, so names missing from it are also looked up on disk in every
+        listed directory. Only names that clearly denote files (quoted, dotfiles,
+        known dotfiles, paths, common extensions) are reported as missing; bare
+        ".name" tokens such as .NET or .csv are ignored unless they are known
+        dotfiles or quoted.
+        """
+        names = [name.rstrip(".") for name in NAMED_FILE_RE.findall(criteria)]
+        names += KNOWN_FILENAME_RE.findall(criteria)
+        if not names:
+            return [], []
+
+        directories = [d.replace(os.sep, "/") for d in tree_structure]
+        files = [
+            filename if directory == "." else f"{directory}/{filename}"
+            for directory, listing in zip(directories, tree_structure.values())
+            for filename in listing or {}
+        ]
+        lowered = [path.lower() for path in files]
+
+        found, missing = [], []
+        for name in dict.fromkeys(names):
+            target = name[2:] if name.startswith("./") else name
+            if target in ("", ".", ".."):
+                continue
+            quoted = (
+                f"`{name}`" in criteria
+                or f'"{name}"' in criteria
+                or f"'{name}'" in criteria
+            )
+            if (
+                target.startswith(".")
+                and "/" not in target
+                and target.lower() not in KNOWN_DOTFILES
+                and not quoted
+            ):
+                continue
+            matches = [
+                files[i]
+                for i, path in enumerate(lowered)
+                if path == target.lower() or path.endswith("/" + target.lower())
+            ]
+            if not matches:
+                matches = [
+                    target if directory == "." else f"{directory}/{target}"
+                    for directory in directories
+                    if os.path.isfile(os.path.join(workspace, directory, target))
+                ]
+            if matches:
+                depth = min(path.count("/") for path in matches)
+                found.extend(sorted(p for p in matches if p.count("/") == depth))
+            elif (
+                quoted
+                or target.startswith(".")
+                or "/" in name
+                or os.path.splitext(name)[1].lower() in REPORTED_EXTENSIONS
+                or name in KNOWN_FILENAMES
+            ):
+                missing.append(name)
+        return list(dict.fromkeys(found)), missing
+
     def _parse_locate(self, response: str) -> list:
         file_paths = []
         for line in response.splitlines():
@@ -85,6 +187,7 @@ class DevLocate:
             "cost": cost,
             # "accumulated_cost": accumulated_cost,
             "inference_time": inference_time,
+            **self.llm.cache_stats(response),
         }
 
 
@@ -1,7 +1,12 @@
 import os
 import re
+import json
 import time
+import hashlib
 import logging
+import tempfile
+import threading
+from pathlib import Path
 from agent_as_a_judge.llm.provider import LLM
 from dotenv import load_dotenv
 from rich.logging import RichHandler
@@ -24,15 +29,19 @@ class Planning:
             model=os.getenv("DEFAULT_LLM"), api_key=os.getenv("OPENAI_API_KEY"), base_url="http://0.0.0.0:30000/v1"
         )
 
-    def generate_plan(self, criteria: str) -> dict:
+    @staticmethod
+    def build_messages(criteria: str) -> list:
         system_prompt = get_planning_system_prompt("English")  #
         user_prompt = get_planning_prompt(criteria)
 
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_prompt},
         ]
 
+    def generate_plan(self, criteria: str) -> dict:
+        messages = self.build_messages(criteria)
+
         start_time = time.time()
         llm_stats = self._llm_inference(messages)
         llm_stats["inference_time"] = time.time() - start_time
@@ -76,4 +85,109 @@ class Planning:
             "output_tokens": output_token,
             "cost": cost,
             # "accumulated_cost": accumulated_cost
+            **self.llm.cache_stats(response),
         }
+
+
+class PlanStore:
+    """
+    Plans for the criteria of one instance file, kept in `plans/<instance name>`
+    next to it. Entries are keyed by a hash of the rendered planning prompt, so a
+    plan is regenerated only when its criterion (or the planning prompt) changes.
+    """
+
+    def __init__(self, instance_file: Path):
+        self.instance_file = Path(instance_file)
+        self.plans_file = self.instance_file.parent / "plans" / self.instance_file.name
+        self.plans = self._load()
+        self.dirty = False
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def criteria_key(criteria: str) -> str:
+        payload = json.dumps(Planning.build_messages(criteria), ensure_ascii=False)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load(self) -> dict:
+        try:
+            with open(self.plans_file, "r", encoding="utf-8") as f:
+                return json.load(f).get("plans", {})
+        except FileNotFoundError:
+            return {}
+        except json.JSONDecodeError as e:
+            logging.warning(f"Failed to load plans from {self.plans_file}: {e}")
+            return {}
+
+    def get(self, criteria: str):
+        entry = self.plans.get(self.criteria_key(criteria))
+        return list(entry["actions"]) if entry else None
+
+    def put(self, criteria: str, actions: list, llm_response: str = None):
+        with self._lock:
+            self.plans[self.criteria_key(criteria)] = {
+                "criteria": criteria,
+                "actions": list(actions),
+                "llm_response": llm_response,
+            }
+            self.dirty = True
+
+    def get_or_generate(self, criteria: str, planning: Planning = None) -> dict:
+        """Return a stored plan, calling the model only for new or changed criteria."""
+        actions = self.get(criteria)
+        if actions is not None:
+            return {"actions": actions, "llm_stats": None}
+
+        planning_result = (planning or Planning()).generate_plan(criteria)
+        self.put(
+            criteria,
+            planning_result["actions"],
+            planning_result["llm_stats"].get("llm_response"),
+        )
+        return planning_result
+
+    def precompute(self, criteria_list: list, force: bool = False) -> int:
+        """Plan every criterion that has no stored plan yet and save the store."""
+        planning = Planning()
+        generated = 0
+        for criteria in criteria_list:
+            if not force and self.get(criteria) is not None:
+                continue
+            planning_result = planning.generate_plan(criteria)
+            self.put(
+                criteria,
+                planning_result["actions"],
+                planning_result["llm_stats"].get("llm_response"),
+            )
+            generated += 1
+        self.save()
+        return generated
+
+    def save(self):
+        with self._lock:
+            # Keep only plans for criteria that are still in the instance file
+            with open(self.instance_file, "r", encoding="utf-8") as f:
+                current_keys = {
+                    self.criteria_key(requirement["criteria"])
+                    for requirement in json.load(f).get("requirements", [])
+                }
+            plans = {
+                key: entry for key, entry in self.plans.items() if key in current_keys
+            }
+            self.plans_file.parent.mkdir(parents=True, exist_ok=True)
+            # Atomic swap: other workers read this file while it is being saved
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=self.plans_file.parent,
+                prefix=f"{self.plans_file.name}.",
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                json.dump(
+                    {"instance": self.instance_file.name, "plans": plans},
+                    f,
+                    indent=4,
+                    ensure_ascii=False,
+                )
+            os.replace(f.name, self.plans_file)
+            self.dirty = False
@@ -20,6 +20,7 @@ from typing import Union, Optional, Tuple
 
 from dotenv import load_dotenv
 from agent_as_a_judge.llm.provider import LLM
+from agent_as_a_judge.utils.truncate import WINDOW_CHARS_PER_TOKEN, truncate_windows
 
 load_dotenv()
 
@@ -48,6 +49,10 @@ logger = logging.getLogger(__name__)
 
 
 class DevRead:
+    # Plain-text formats whose very large files are excerpted from their two ends
+    STREAM_SUFFIXES = {".txt", ".csv", ".sql", ".py", ".ts", ".tsx", ".cs"}
+    STREAM_MIN_BYTES = 1 << 20
+
     def __init__(self):
         self.reader_map = {
             ".txt": self.read_txt,
@@ -116,6 +121,63 @@ class DevRead:
                 None,
             )
 
+    def read_excerpt(
+        self, file_path: Path, max_tokens: int = 2000, task: Optional[str] = None
+    ) -> Tuple[str, Optional[dict]]:
+        """
+        File content as evidence, cut to about `max_tokens` tokens.
+
+        Very large plain-text files (generated code, dumps, CSVs) are never
+        loaded whole: only windows at their head and tail are read, growing
+        until they hold enough tokens. Other files go through `read`.
+        """
+        if (
+            file_path.suffix.lower() in self.STREAM_SUFFIXES
+            and file_path.is_file()
+            and file_path.stat().st_size >= self.STREAM_MIN_BYTES
+        ):
+            try:
+                excerpt = self._stream_excerpt(file_path, max_tokens)
+            except Exception as e:
+                logger.error(f"Error streaming file {file_path}: {e}")
+                excerpt = None
+            if excerpt is not None:
+                return excerpt, None
+
+        content, llm_stats = self.read(file_path, task)
+        # Most readers return (content, llm_stats) themselves
+        if isinstance(content, tuple):
+            content, llm_stats = content
+        return content, llm_stats
+
+    def _stream_excerpt(self, file_path: Path, max_tokens: int) -> Optional[str]:
+
+        size = file_path.stat().st_size
+        window = WINDOW_CHARS_PER_TOKEN * (max_tokens + 1)
+        with open(file_path, "rb") as f:
+            # Detected from the head only, like read_txt does from the whole file
+            match = charset_normalizer.from_bytes(f.read(window)).best()
+            encoding = match.encoding if match else "utf-8"
+            f.seek(0)
+            while 2 * window < size:
+                head = f.read(window)
+                f.seek(size - window)
+                tail = f.read(window)
+                f.seek(0)
+                excerpt = truncate_windows(
+                    head.decode(encoding, errors="replace"),
+                    tail.decode(encoding, errors="replace"),
+                    max_tokens,
+                )
+                if excerpt is not None:
+                    logger.info(
+                        f"Read {2 * window} of {size} bytes from {file_path} ({encoding}) for a {max_tokens}-token excerpt."
+                    )
+                    return excerpt
+                # Sparse text, e.g. long runs of whitespace; widen the windows
+                window *= 4
+        return None
+
     def read_py(
         self, file_path: Path, task: Optional[str] = None
     ) -> Tuple[str, Optional[dict]]:
@@ -0,0 +1,187 @@
+import os
+import pickle
+import logging
+import tempfile
+from array import array
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from agent_as_a_judge.module.tag_store import TagStore
+
+__all__ = ["TagIndex"]
+
+GRAM = 3
+
+
+def _grams(text: str) -> set:
+    return {text[i : i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+def _csr(keys: np.ndarray, values: np.ndarray, n_keys: int):
+    """Postings of `values` grouped by `keys`, as (ptr, ids) with sorted ids per key."""
+    order = np.lexsort((values, keys))
+    ptr = np.concatenate([[0], np.cumsum(np.bincount(keys, minlength=n_keys))])
+    return ptr.astype(np.int64), values[order].astype(np.int32)
+
+
+class _FieldIndex:
+    """
+    Case-insensitive index over one tag field.
+
+    Every distinct lowercased value maps to the tags holding it, and every
+    trigram of those values maps to the values containing it. An exact lookup is
+    a dict hit; a substring lookup intersects the postings of the substring's
+    trigrams and verifies the few surviving values.
+    """
+
+    def __init__(self, column: List[str]):
+        value_ids = {}
+        tag_values = np.fromiter(
+            (value_ids.setdefault((value or "").lower(), len(value_ids)) for value in column),
+            dtype=np.int64,
+            count=len(column),
+        )
+        self.values = list(value_ids)
+        self.value_ids = value_ids
+        self.tag_ptr, self.tag_ids = _csr(
+            tag_values, np.arange(len(column)), len(self.values)
+        )
+
+        gram_ids = {}
+        gram_keys, gram_values = array("q"), array("q")
+        for value_id, value in enumerate(self.values):
+            for gram in _grams(value):
+                gram_keys.append(gram_ids.setdefault(gram, len(gram_ids)))
+                gram_values.append(value_id)
+        self.gram_ids = gram_ids
+        self.gram_ptr, self.gram_values = _csr(
+            np.frombuffer(gram_keys, dtype=np.int64),
+            np.frombuffer(gram_values, dtype=np.int64),
+            len(gram_ids),
+        )
+
+    def _tags_of(self, value_ids) -> np.ndarray:
+        if len(value_ids) == 0:
+            return np.empty(0, dtype=np.int32)
+        return np.sort(
+            np.concatenate(
+                [self.tag_ids[self.tag_ptr[v] : self.tag_ptr[v + 1]] for v in value_ids]
+            )
+        )
+
+    def lookup(self, value: str) -> np.ndarray:
+        value_id = self.value_ids.get(value.lower())
+        if value_id is None:
+            return np.empty(0, dtype=np.int32)
+        return self.tag_ids[self.tag_ptr[value_id] : self.tag_ptr[value_id + 1]]
+
+    def contains(self, substring: str) -> np.ndarray:
+        substring = substring.lower()
+        grams = _grams(substring)
+        if not grams:
+            # Too short for a trigram; the distinct values are still far fewer than tags
+            candidates = range(len(self.values))
+        else:
+            postings = []
+            for gram in grams:
+                gram_id = self.gram_ids.get(gram)
+                if gram_id is None:
+                    return np.empty(0, dtype=np.int32)
+                postings.append(
+                    self.gram_values[self.gram_ptr[gram_id] : self.gram_ptr[gram_id + 1]]
+                )
+            postings.sort(key=len)
+            candidates = postings[0]
+            for posting in postings[1:]:
+                candidates = np.intersect1d(candidates, posting, assume_unique=True)
+            candidates = candidates.tolist()
+
+        return self._tags_of([v for v in candidates if substring in self.values[v]])
+
+
+class TagIndex:
+    """
+    Inverted indexes over the tag fields used by `DevCodeSearch.accurate_search`.
+
+    Lookups return sorted tag positions, so matches keep the tags' order. The
+    index is pickled next to the graph (`tag_index.pkl`) together with a
+    signature of the tags file it was built from.
+    """
+
+    INDEX_FILE = "tag_index.pkl"
+    FIELDS = ("name", "identifier", "category", "rel_fname", "details")
+
+    def __init__(self, fields: Dict[str, _FieldIndex], n_tags: int, signature: str = ""):
+        self.fields = fields
+        self.n_tags = n_tags
+        self.signature = signature
+
+    @classmethod
+    def build(cls, tags, signature: str = "") -> "TagIndex":
+        if isinstance(tags, TagStore):
+            columns = {
+                field: tags.column(field) for field in cls.FIELDS if field != "details"
+            }
+            columns["details"] = [tags.get_details(i) for i in range(len(tags))]
+        else:
+            columns = {field: [tag.get(field) for tag in tags] for field in cls.FIELDS}
+        return cls(
+            {field: _FieldIndex(column) for field, column in columns.items()},
+            len(tags),
+            signature,
+        )
+
+    @staticmethod
+    def signature_of(tags_file: Path) -> str:
+        """Size and modification time of the tags file; empty when it is missing."""
+        try:
+            stat = os.stat(tags_file)
+        except OSError:
+            return ""
+        return f"{stat.st_size}:{stat.st_mtime_ns}"
+
+    def lookup(self, field: str, value: str) -> np.ndarray:
+        """Tags whose `field` equals `value`, ignoring case."""
+        return self.fields[field].lookup(value)
+
+    def contains(self, field: str, substring: str) -> np.ndarray:
+        """Tags whose `field` contains `substring`, ignoring case."""
+        return self.fields[field].contains(substring)
+
+    def save(self, path: Path):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+        ) as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path: Path, n_tags: int = None, signature: str = None) -> "TagIndex":
+        """The saved index, or None when missing or built from other tags."""
+        try:
+            with open(path, "rb") as f:
+                index = pickle.load(f)
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Failed to load tag index {path}: {e}")
+            return None
+        if (n_tags is not None and index.n_tags != n_tags) or (
+            signature is not None and index.signature != signature
+        ):
+            return None
+        return index
+
+    @classmethod
+    def load_or_build(cls, path: Path, tags, signature: str = "") -> "TagIndex":
+        index = cls.load(path, len(tags), signature) if path else None
+        if index is None:
+            logging.info(f"Building tag index over {len(tags)} tags...")
+            index = cls.build(tags, signature)
+            if path:
+                index.save(path)
+        return index
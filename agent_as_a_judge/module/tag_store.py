@@ -0,0 +1,167 @@
+import os
+import mmap
+import logging
+from pathlib import Path
+from collections.abc import Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+class TagStore(Sequence):
+    """
+    Columnar, memory-mapped store for the code graph tags of one workspace.
+
+    The fixed fields live in an Arrow IPC file (`tags.arrow`) with dictionary
+    encoded string columns and integer line columns; each tag's `details` is kept
+    in a separate blob (`tags_details.bin`) addressed by offset and length. Both
+    files are memory-mapped on open, and a tag is only turned into a dict, in the
+    format of the former tags.json, when it is accessed.
+    """
+
+    TABLE_FILE = "tags.arrow"
+    DETAILS_FILE = "tags_details.bin"
+    FILTER_FIELDS = ("fname", "rel_fname", "name", "identifier", "category")
+
+    def __init__(self, table: pa.Table, details):
+        self.table = table
+        self.details = details
+        self._columns = {}
+
+    @classmethod
+    def exists(cls, judge_path) -> bool:
+        judge_path = Path(judge_path)
+        return (judge_path / cls.TABLE_FILE).exists() and (
+            judge_path / cls.DETAILS_FILE
+        ).exists()
+
+    @classmethod
+    def write(cls, judge_path, tags):
+        """Write graph `Tag` tuples; files are swapped in atomically."""
+        judge_path = Path(judge_path)
+        judge_path.mkdir(parents=True, exist_ok=True)
+        tags = tags or []
+
+        offsets, lengths, line_start, line_end = [], [], [], []
+        details_tmp = judge_path / f"{cls.DETAILS_FILE}.{os.getpid()}.tmp"
+        with open(details_tmp, "wb") as f:
+            offset = 0
+            for tag in tags:
+                data = (tag.details or "").encode("utf-8")
+                f.write(data)
+                offsets.append(offset)
+                lengths.append(len(data))
+                offset += len(data)
+
+                # A list is a [start, end] span; a scalar (e.g. -1) has no end
+                if isinstance(tag.line, (list, tuple)):
+                    line_start.append(tag.line[0])
+                    line_end.append(tag.line[1])
+                else:
+                    line_start.append(tag.line)
+                    line_end.append(None)
+
+        def dictionary(values):
+            return pa.array(values, type=pa.string()).dictionary_encode()
+
+        table = pa.table(
+            {
+                "fname": dictionary([tag.fname for tag in tags]),
+                "rel_fname": dictionary([tag.rel_fname for tag in tags]),
+                "line_start": pa.array(line_start, type=pa.int32()),
+                "line_end": pa.array(line_end, type=pa.int32()),
+                "name": pa.array([tag.name for tag in tags], type=pa.string()),
+                "identifier": dictionary([tag.identifier for tag in tags]),
+                "category": dictionary([tag.category for tag in tags]),
+                "details_offset": pa.array(offsets, type=pa.int64()),
+                "details_length": pa.array(lengths, type=pa.int64()),
+            }
+        )
+        table_tmp = judge_path / f"{cls.TABLE_FILE}.{os.getpid()}.tmp"
+        with pa.OSFile(str(table_tmp), "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+
+        os.replace(details_tmp, judge_path / cls.DETAILS_FILE)
+        os.replace(table_tmp, judge_path / cls.TABLE_FILE)
+
+    @classmethod
+    def open(cls, judge_path) -> "TagStore":
+        judge_path = Path(judge_path)
+        source = pa.memory_map(str(judge_path / cls.TABLE_FILE), "r")
+        table = pa.ipc.open_file(source).read_all()
+
+        with open(judge_path / cls.DETAILS_FILE, "rb") as f:
+            # mmap refuses empty files; a workspace without tags has no details
+            if os.fstat(f.fileno()).st_size:
+                details = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                details = b""
+        logging.info(f"Loaded {table.num_rows} tags from {judge_path / cls.TABLE_FILE}")
+        return cls(table, details)
+
+    def __len__(self) -> int:
+        return self.table.num_rows
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("tag index out of range")
+
+        line_start = self.column("line_start")[index]
+        line_end = self.column("line_end")[index]
+        return {
+            "fname": self.column("fname")[index],
+            "rel_fname": self.column("rel_fname")[index],
+            "line_number": line_start if line_end is None else [line_start, line_end],
+            "name": self.column("name")[index],
+            "identifier": self.column("identifier")[index],
+            "category": self.column("category")[index],
+            "details": self.get_details(index),
+        }
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self[index]
+
+    def column(self, name: str) -> list:
+        """One fixed field for every tag, decoded once and memoised."""
+        if name not in self._columns:
+            column = self.table.column(name).combine_chunks()
+            if pa.types.is_dictionary(column.type):
+                # Rows share one Python string per distinct value
+                dictionary = column.dictionary.to_pylist()
+                values = [
+                    None if index is None else dictionary[index]
+                    for index in column.indices.to_pylist()
+                ]
+            else:
+                values = column.to_pylist()
+            self._columns[name] = values
+        return self._columns[name]
+
+    def get_details(self, index: int) -> str:
+        offset = self.column("details_offset")[index]
+        length = self.column("details_length")[index]
+        return bytes(self.details[offset : offset + length]).decode("utf-8")
+
+    def mask(self, **filters) -> np.ndarray:
+        """
+        Boolean mask of the tags whose fields equal the given values, e.g.
+        `mask(identifier="def")`; a value may also be a list of accepted values.
+
+        Computed on the Arrow columns, so no tag or column list is materialised.
+        """
+        mask = pa.array(np.ones(len(self), dtype=bool))
+        for field, value in filters.items():
+            if field not in self.FILTER_FIELDS:
+                raise ValueError(f"Unsupported filter field: {field}")
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            column = self.table.column(field).cast(pa.string())
+            condition = pc.is_in(column, value_set=pa.array(list(values), type=pa.string()))
+            mask = pc.and_(mask, pc.fill_null(condition, False))
+        return np.asarray(mask, dtype=bool)
@@ -4,18 +4,17 @@ import json
 import logging
 import time
 from typing import List, Dict, Any, Union
-import spacy
 from pathlib import Path
-from rapidfuzz import fuzz
-from rank_bm25 import BM25Okapi
 import numpy as np
-from sentence_transformers import SentenceTransformer, util
 from agent_as_a_judge.llm.provider import LLM
+from agent_as_a_judge.llm.embedding import EmbeddingService
 from agent_as_a_judge.module.prompt.system_prompt_retrieve import (
     get_retrieve_system_prompt,
 )
 from agent_as_a_judge.module.prompt.prompt_retrieve import get_text_retrieve_prompt
-from agent_as_a_judge.utils import truncate_string
+from agent_as_a_judge.module.vector_index import build_vector_index
+from agent_as_a_judge.module.bm25_index import BM25Index
+from agent_as_a_judge.utils import truncate_string, truncate_strings, fuzzy_top_k
 from rich.logging import RichHandler
 from rich.console import Console
 from rich.table import Table
@@ -32,24 +31,19 @@ logging.basicConfig(
 
 
 class DevTextRetrieve:
-    def __init__(self, trajectory_file: str):
+    def __init__(self, trajectory_file: str, index_dir: str = None):
         self.trajectory_file = Path(trajectory_file)
+        self.index_dir = Path(index_dir) if index_dir else None
         self.raw_trajectory_data = self.load_trajectory_data()
         self.text_data = self.process_trajectory_data()
-        self.spacy_nlp = None
+        self.lowered_contents = None
         self.bm25 = None
-        self.embedding_model = SentenceTransformer("/workspace-SR003.nfs2/all-MiniLM-L6-v2")
+        self.embedding_service = EmbeddingService.get()
         self.text_embeddings = None
         self.llm = LLM(
             model=os.getenv("DEFAULT_LLM"), api_key=os.getenv("OPENAI_API_KEY"), base_url="http://0.0.0.0:30000/v1"
         )
 
-    @property
-    def _spacy(self):
-        if self.spacy_nlp is None:
-            self.spacy_nlp = spacy.load("en_core_web_sm")
-        return self.spacy_nlp
-
     def load_trajectory_data(self) -> List[Dict[str, Any]]:
 
         try:
@@ -61,53 +55,42 @@ class DevTextRetrieve:
 
     def process_trajectory_data(self) -> List[Dict[str, Any]]:
 
+        entries = self.raw_trajectory_data
+        agents = [entry.get("agent", {}) for entry in entries]
+
+        # Truncate each field for all steps in one batch
+        user_messages = truncate_strings(
+            [entry.get("user_message", "") for entry in entries], max_tokens=300
+        )
+        actions = truncate_strings(
+            [agent_info.get("action", "") for agent_info in agents], max_tokens=50
+        )
+        thoughts = truncate_strings(
+            [agent_info.get("thought", "") for agent_info in agents], max_tokens=100
+        )
+        environments = truncate_strings(
+            [entry.get("environment", "") for entry in entries], max_tokens=100
+        )
+
         processed_data = []
 
-        for entry in self.raw_trajectory_data:
+        for i, entry in enumerate(entries):
             content_parts = []
 
-            # Extract relevant fields and truncate if necessary
             step = entry.get("step")
             if step is not None:
                 content_parts.append(f"Step: {step}")
 
-            user_message = entry.get("user_message", "")
-            if user_message:
-                truncated_message = truncate_string(
-                    user_message,
-                    model=os.getenv("DEFAULT_LLM"),
-                    max_tokens=300,
-                    drop_mode="middle",
-                )
-                content_parts.append(f"User Message: {truncated_message}")
-
-            agent_info = entry.get("agent", {})
-            agent_name = agent_info.get("agent_name", "Default")
-            action = truncate_string(
-                agent_info.get("action", ""),
-                model=os.getenv("DEFAULT_LLM"),
-                max_tokens=50,
-                drop_mode="middle",
-            )
-            thought = truncate_string(
-                agent_info.get("thought", ""),
-                model=os.getenv("DEFAULT_LLM"),
-                max_tokens=100,
-                drop_mode="middle",
-            )
+            if entry.get("user_message", ""):
+                content_parts.append(f"User Message: {user_messages[i]}")
+
+            agent_name = agents[i].get("agent_name", "Default")
             content_parts.append(f"Agent Name: {agent_name}")
-            content_parts.append(f"Action: {action}")
-            content_parts.append(f"Thought: {thought}")
-
-            environment = entry.get("environment", "")
-            if environment:
-                truncated_environment = truncate_string(
-                    environment,
-                    model=os.getenv("DEFAULT_LLM"),
-                    max_tokens=100,
-                    drop_mode="middle",
-                )
-                content_parts.append(f"Environment: {truncated_environment}")
+            content_parts.append(f"Action: {actions[i]}")
+            content_parts.append(f"Thought: {thoughts[i]}")
+
+            if entry.get("environment", ""):
+                content_parts.append(f"Environment: {environments[i]}")
 
             # Create processed entry
             processed_entry = {
@@ -126,11 +109,17 @@ class DevTextRetrieve:
         if search_type == "accurate":
             return self.accurate_search(query=query, **kwargs)
         elif search_type == "fuzzy":
-            return self.fuzzy_search(query=query, threshold=kwargs.get("threshold", 70))
+            return self.fuzzy_search(
+                query=query,
+                threshold=kwargs.get("threshold", 70),
+                top_n=kwargs.get("top_n"),
+            )
         elif search_type == "bm25":
             return self.bm25_search(query=query, top_n=kwargs.get("top_n", 5))
         elif search_type == "embedding":
-            return self.embedding_search(query=query, top_n=kwargs.get("top_n", 10))
+            return self.embedding_search(
+                query=query, top_n=kwargs.get("top_n", 10), filters=kwargs.get("filters")
+            )
         elif search_type == "llm_summary":
             return self.llm_summary(criteria=query)
         else:
@@ -152,13 +141,17 @@ class DevTextRetrieve:
                     results.append(text_entry)
         return results
 
-    def fuzzy_search(self, query: str, threshold: int = 70) -> List[Dict[str, Any]]:
+    def fuzzy_search(
+        self, query: str, threshold: int = 70, top_n: int = None
+    ) -> List[Dict[str, Any]]:
 
+        if self.lowered_contents is None:
+            self.lowered_contents = [
+                entry.get("content", "").lower() for entry in self.text_data
+            ]
         return [
-            entry
-            for entry in self.text_data
-            if fuzz.partial_ratio(query.lower(), entry.get("content", "").lower())
-            >= threshold
+            self.text_data[i]
+            for i in fuzzy_top_k(query, [self.lowered_contents], threshold, top_n)
         ]
 
     def bm25_search(self, query: str, top_n: int = 5) -> List[Dict[str, Any]]:
@@ -168,39 +161,41 @@ class DevTextRetrieve:
             return []
 
         if self.bm25 is None:
-            self.corpus = [
-                [
-                    token.text.lower()
-                    for token in self._spacy(entry.get("content", ""))
-                    if not token.is_stop and not token.is_punct
-                ]
-                for entry in self.text_data
-            ]
-            self.bm25 = BM25Okapi(self.corpus)
-
-        tokenized_query = [
-            token.text.lower()
-            for token in self._spacy(query)
-            if not token.is_stop and not token.is_punct
-        ]
-        scores = self.bm25.get_scores(tokenized_query)
-        top_n_indices = np.argsort(scores)[::-1][:top_n]
+            self.bm25 = BM25Index.load_or_build(
+                self.index_dir / "trajectory_bm25.npz" if self.index_dir else None,
+                [entry.get("content", "") for entry in self.text_data],
+            )
+        top_n_indices = self.bm25.top_n(query, top_n)
         return [self.text_data[i] for i in top_n_indices]
 
-    def embedding_search(self, query: str, top_n: int = 5) -> List[Dict[str, Any]]:
+    def embedding_search(
+        self, query: str, top_n: int = 5, filters: Dict[str, Any] = None
+    ) -> List[Dict[str, Any]]:
 
         if self.text_embeddings is None:
             self.text_embeddings = self._generate_text_embeddings()
 
-        query_embedding = self.embedding_model.encode(query, convert_to_tensor=True)
-        similarities = util.pytorch_cos_sim(query_embedding, self.text_embeddings)[0]
-        top_n_indices = similarities.topk(k=top_n)[1]
+        query_embedding = self.embedding_service.encode(query)
+        top_n_indices, _ = self.text_embeddings.search(
+            query_embedding, top_k=top_n, filters=filters
+        )
         return [self.text_data[i] for i in top_n_indices]
 
     def _generate_text_embeddings(self):
 
         texts_content = [entry.get("content", "") for entry in self.text_data]
-        return self.embedding_model.encode(texts_content, convert_to_tensor=True)
+        embeddings = (
+            self.embedding_service.encode(texts_content)
+            if texts_content
+            else np.zeros((0, 1), dtype=np.float32)
+        )
+        return build_vector_index(
+            embeddings,
+            metadata={
+                field: [entry.get(field, "") for entry in self.text_data]
+                for field in ("title", "source")
+            },
+        )
 
     def llm_summary(self, criteria: str) -> Dict[str, Any]:
 
@@ -242,6 +237,7 @@ class DevTextRetrieve:
             "cost": cost,
             # "accumulated_cost": accumulated_cost,
             "inference_time": inference_time,
+            **self.llm.cache_stats(response),
         }
 
     def display(self, text_entries: List[Dict[str, Any]]) -> str:
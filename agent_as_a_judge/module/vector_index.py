@@ -0,0 +1,282 @@
+import os
+import logging
+import tempfile
+from pathlib import Path
+from typing import Dict, Any, List, Tuple
+
+import numpy as np
+
+__all__ = ["ExactVectorIndex", "IVFVectorIndex", "build_vector_index"]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def _top_k(ids: np.ndarray, scores: np.ndarray, top_k: int) -> Tuple[np.ndarray, np.ndarray]:
+    if len(ids) > top_k:
+        part = np.argpartition(-scores, top_k - 1)[:top_k]
+        ids, scores = ids[part], scores[part]
+    order = np.lexsort((ids, -scores))
+    return ids[order], scores[order]
+
+
+class ExactVectorIndex:
+    """
+    Brute-force cosine search over a matrix of L2-normalised vectors.
+
+    `vectors` may be a memory-mapped array; `metadata` maps a field name to one
+    value per vector and is used by the `filters` of `search`.
+    """
+
+    def __init__(self, vectors: np.ndarray, metadata: Dict[str, Any] = None):
+        self.vectors = vectors
+        self.metadata = {
+            field: np.asarray(values, dtype=object)
+            for field, values in (metadata or {}).items()
+        }
+
+    def __len__(self) -> int:
+        return len(self.vectors)
+
+    def filter_mask(self, filters: Dict[str, Any] = None, mask: np.ndarray = None):
+        """Boolean mask of the vectors allowed by `mask` and every metadata filter."""
+        for field, value in (filters or {}).items():
+            if field not in self.metadata:
+                raise ValueError(f"Unknown metadata field: {field}")
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            condition = np.isin(self.metadata[field], list(values))
+            mask = condition if mask is None else mask & condition
+        return mask
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int = 10,
+        filters: Dict[str, Any] = None,
+        mask: np.ndarray = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """Ids and cosine scores of the `top_k` best allowed vectors, best first."""
+        if len(self) == 0 or top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query = _normalize(query).reshape(-1)
+        mask = self.filter_mask(filters, mask)
+        scores = self.vectors @ query
+        ids = np.arange(len(self), dtype=np.int64)
+        if mask is not None:
+            ids, scores = ids[mask], scores[mask]
+        return _top_k(ids, scores, top_k)
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int = 10,
+        filters: Dict[str, Any] = None,
+        mask: np.ndarray = None,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """`search` for each row of `queries`, scored with a single matrix product."""
+        queries = _normalize(queries).reshape(len(queries), -1)
+        if len(self) == 0 or top_k <= 0:
+            return [self.search(query, top_k) for query in queries]
+
+        mask = self.filter_mask(filters, mask)
+        ids = np.arange(len(self), dtype=np.int64)
+        scores = self.vectors @ queries.T
+        if mask is not None:
+            ids, scores = ids[mask], scores[mask]
+        return [_top_k(ids, scores[:, j], top_k) for j in range(len(queries))]
+
+
+class IVFVectorIndex(ExactVectorIndex):
+    """
+    Inverted-file approximate index: vectors are clustered around `n_lists`
+    spherical k-means centroids, and a query only scores the vectors of its
+    `n_probe` closest clusters. When filters leave fewer than `top_k`
+    candidates, more clusters are probed, down to an exact search.
+    """
+
+    def __init__(
+        self,
+        vectors: np.ndarray,
+        metadata: Dict[str, Any] = None,
+        n_lists: int = None,
+        n_probe: int = None,
+        centroids: np.ndarray = None,
+        assignments: np.ndarray = None,
+        seed: int = 0,
+    ):
+        super().__init__(vectors, metadata)
+        self.n_lists = n_lists or max(1, int(np.sqrt(len(vectors))))
+        self.n_probe = n_probe or int(os.getenv("VECTOR_INDEX_NPROBE", 8))
+        self.seed = seed
+
+        if centroids is None:
+            centroids = self._train()
+        self.centroids = centroids
+        self.n_lists = len(centroids)
+
+        assignments = np.asarray(
+            assignments if assignments is not None else [], dtype=np.int64
+        )
+        # Vectors appended since the assignments were saved join their closest list
+        self.n_new = len(vectors) - len(assignments)
+        if self.n_new:
+            assignments = np.concatenate(
+                [assignments, self._assign(self.vectors[len(assignments) :])]
+            )
+        self.assignments = assignments
+        self._build_lists()
+
+    def _assign(self, vectors: np.ndarray, chunk_size: int = 65536) -> np.ndarray:
+        if len(vectors) == 0:
+            return np.empty(0, dtype=np.int64)
+        return np.concatenate(
+            [
+                np.argmax(np.asarray(vectors[start : start + chunk_size]) @ self.centroids.T, axis=1)
+                for start in range(0, len(vectors), chunk_size)
+            ]
+        ).astype(np.int64)
+
+    def _train(self, n_iter: int = 10, sample_per_list: int = 64) -> np.ndarray:
+        rng = np.random.default_rng(self.seed)
+        n = len(self.vectors)
+        self.n_lists = min(self.n_lists, n) or 1
+        if n == 0:
+            return np.zeros((1, self.vectors.shape[1]), dtype=np.float32)
+
+        sample_size = min(n, self.n_lists * sample_per_list)
+        sample = np.asarray(
+            self.vectors[np.sort(rng.choice(n, sample_size, replace=False))],
+            dtype=np.float32,
+        )
+        self.centroids = sample[rng.choice(sample_size, self.n_lists, replace=False)]
+        for _ in range(n_iter):
+            labels = self._assign(sample)
+            sums = np.zeros_like(self.centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=self.n_lists)
+            empty = counts == 0
+            # Re-seed empty lists with random sample points
+            sums[empty] = sample[rng.choice(sample_size, int(empty.sum()))]
+            self.centroids = _normalize(sums)
+        return self.centroids
+
+    def _build_lists(self):
+        self.list_ids = np.argsort(self.assignments, kind="stable").astype(np.int64)
+        counts = np.bincount(self.assignments, minlength=self.n_lists)
+        self.list_offsets = np.concatenate([[0], np.cumsum(counts)])
+
+    def search(
+        self,
+        query: np.ndarray,
+        top_k: int = 10,
+        filters: Dict[str, Any] = None,
+        mask: np.ndarray = None,
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        if len(self) == 0 or top_k <= 0:
+            return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float32)
+
+        query = _normalize(query).reshape(-1)
+        mask = self.filter_mask(filters, mask)
+        list_order = np.argsort(-(self.centroids @ query), kind="stable")
+
+        n_probe = min(self.n_probe, self.n_lists)
+        while True:
+            candidates = np.concatenate(
+                [
+                    self.list_ids[self.list_offsets[i] : self.list_offsets[i + 1]]
+                    for i in list_order[:n_probe]
+                ]
+            )
+            if mask is not None:
+                candidates = candidates[mask[candidates]]
+            if len(candidates) >= top_k or n_probe >= self.n_lists:
+                break
+            n_probe = min(n_probe * 2, self.n_lists)
+
+        candidates = np.sort(candidates)
+        scores = np.asarray(self.vectors[candidates]) @ query
+        return _top_k(candidates, scores, top_k)
+
+    def search_batch(
+        self,
+        queries: np.ndarray,
+        top_k: int = 10,
+        filters: Dict[str, Any] = None,
+        mask: np.ndarray = None,
+    ) -> List[Tuple[np.ndarray, np.ndarray]]:
+        # Each query probes its own lists, so only the filter mask is shared
+        mask = self.filter_mask(filters, mask)
+        return [self.search(query, top_k, mask=mask) for query in queries]
+
+    def save(self, path: Path, **info):
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f"{path.name}.", suffix=".tmp", delete=False
+        ) as f:
+            np.savez(
+                f,
+                centroids=self.centroids,
+                assignments=self.assignments,
+                info=np.array([repr(sorted(info.items()))]),
+            )
+        os.replace(f.name, path)
+
+    @classmethod
+    def load(cls, path: Path, vectors: np.ndarray, metadata=None, **info):
+        """Reuse saved clusters when `info` matches and no vector was removed."""
+        try:
+            with np.load(path) as data:
+                if str(data["info"][0]) != repr(sorted(info.items())):
+                    return None
+                if len(data["assignments"]) > len(vectors):
+                    return None
+                return cls(
+                    vectors,
+                    metadata,
+                    centroids=data["centroids"],
+                    assignments=data["assignments"],
+                )
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            logging.warning(f"Failed to load vector index {path}: {e}")
+            return None
+
+
+def build_vector_index(
+    vectors: np.ndarray,
+    metadata: Dict[str, Any] = None,
+    backend: str = None,
+    cache_file: Path = None,
+    **info,
+):
+    """
+    Exact index for small collections, IVF above `VECTOR_INDEX_IVF_MIN` vectors.
+
+    `backend` (or `VECTOR_INDEX_BACKEND`) forces "exact" or "ivf". With a
+    `cache_file`, IVF clusters are saved and reused while `info` is unchanged.
+    """
+    backend = backend or os.getenv("VECTOR_INDEX_BACKEND", "auto")
+    if backend == "auto":
+        min_size = int(os.getenv("VECTOR_INDEX_IVF_MIN", 50000))
+        backend = "ivf" if len(vectors) >= min_size else "exact"
+
+    if backend == "exact":
+        return ExactVectorIndex(vectors, metadata)
+    if backend != "ivf":
+        raise ValueError(f"Unsupported vector index backend: {backend}")
+
+    index = IVFVectorIndex.load(cache_file, vectors, metadata, **info) if cache_file else None
+    if index is None:
+        logging.info(f"Building IVF vector index over {len(vectors)} vectors...")
+        index = IVFVectorIndex(vectors, metadata)
+        if cache_file:
+            index.save(cache_file, **info)
+    elif index.n_new:
+        index.save(cache_file, **info)
+    return index
@@ -0,0 +1,108 @@
+import os
+from collections import Counter
+from typing import Dict, List
+
+from agent_as_a_judge.module.bm25_index import tokenize
+from agent_as_a_judge.utils.truncate import encode_tokens
+
+__all__ = ["summarize_workspace"]
+
+
+def _extension(filename: str) -> str:
+    return os.path.splitext(filename)[1].lower()
+
+
+def _depth(directory: str) -> int:
+    return 0 if directory == "." else directory.count("/") + 1
+
+
+def summarize_workspace(
+    workspace: str,
+    tree_structure: Dict[str, Dict[str, None]],
+    criteria: str = "",
+    file_scores: Dict[str, float] = None,
+    max_tokens: int = 2000,
+    max_depth: int = 3,
+    collapse_over: int = 12,
+) -> str:
+    """
+    Compact listing of the workspace for the locate prompt.
+
+    One line per directory, relative to the workspace root. Directories with
+    more than `collapse_over` files are summarised by extension, keeping only
+    the files relevant to the criteria, and irrelevant directories below
+    `max_depth` are folded into their ancestor. Directories are ordered by
+    relevance (criteria terms in paths plus `file_scores`, e.g. from the tag
+    index) so the token budget cuts the least relevant ones.
+    """
+    # Substrings rather than whole tokens, so "cookie jar" finds cookiejar.py
+    terms = [term for term in set(tokenize(criteria)) if len(term) >= 3]
+    file_scores = file_scores or {}
+
+    def path_score(path: str) -> float:
+        path = path.lower()
+        return 2.0 * sum(term in path for term in terms)
+
+    entries = []
+    for directory, files in tree_structure.items():
+        directory = directory.replace(os.sep, "/")
+        scored = {}
+        for filename in files or {}:
+            rel_path = filename if directory == "." else f"{directory}/{filename}"
+            score = path_score(filename) + file_scores.get(rel_path, 0.0)
+            if score > 0:
+                scored[filename] = score
+        dir_score = path_score(directory) + max(scored.values(), default=0.0)
+        entries.append((directory, list(files or {}), scored, dir_score))
+
+    # Fold irrelevant directories below max_depth into their ancestor
+    folded = Counter()
+    folded_dirs = Counter()
+    lines = []
+    for order, (directory, files, scored, dir_score) in enumerate(entries):
+        if max_depth is not None and _depth(directory) > max_depth and dir_score == 0:
+            ancestor = "/".join(directory.split("/")[:max_depth])
+            folded[ancestor] += len(files)
+            folded_dirs[ancestor] += 1
+            continue
+        lines.append((dir_score, order, directory, files, scored))
+
+    def render(directory: str, files: List[str], scored: Dict[str, float]) -> str:
+        label = "./" if directory == "." else f"{directory}/"
+        if len(files) <= collapse_over:
+            listing = ", ".join(files)
+        else:
+            counts = Counter(_extension(f) for f in files).most_common()
+            listing = ", ".join(
+                f"{n} {ext} files" if ext else f"{n} files without extension"
+                for ext, n in counts
+            )
+            relevant = sorted(scored, key=scored.get, reverse=True)[:8]
+            if relevant:
+                listing += f"; relevant: {', '.join(relevant)}"
+        if folded[directory]:
+            listing += (
+                f"{'; ' if listing else ''}+{folded[directory]} files in "
+                f"{folded_dirs[directory]} subdirectories"
+            )
+        return f"{label}: {listing}"
+
+    header = (
+        f"Workspace root: {workspace}\n"
+        "One line per directory, relative to the root (`dir/: files`); "
+        "directories most related to the criteria come first. "
+        f"Return full paths, e.g. ${workspace.rstrip('/')}/dir/file$.\n"
+    )
+    budget = max_tokens - len(encode_tokens(header))
+    output = [header]
+    # Relevant directories first, the rest in walk order
+    ordered = sorted(lines, key=lambda line: (-line[0], line[1]))
+    for shown, (_, _, directory, files, scored) in enumerate(ordered):
+        line = render(directory, files, scored) + "\n"
+        cost = len(encode_tokens(line))
+        if cost > budget:
+            output.append(f"... {len(ordered) - shown} more directories omitted\n")
+            break
+        output.append(line)
+        budget -= cost
+    return "".join(output)
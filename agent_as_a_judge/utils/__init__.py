@@ -1,5 +1,13 @@
-from agent_as_a_judge.utils.truncate import truncate_string
+from agent_as_a_judge.utils.truncate import truncate_string, truncate_strings
 from agent_as_a_judge.utils.count_lines import count_lines_of_code
+from agent_as_a_judge.utils.fuzzy import fuzzy_top_k
+from agent_as_a_judge.utils.evidence import EvidenceBuilder
 
 
-__all__ = ["truncate_string", "count_lines_of_code"]
+__all__ = [
+    "truncate_string",
+    "truncate_strings",
+    "count_lines_of_code",
+    "fuzzy_top_k",
+    "EvidenceBuilder",
+]
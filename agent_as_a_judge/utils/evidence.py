@@ -0,0 +1,116 @@
+import logging
+from collections import namedtuple
+from typing import List, Union
+
+from agent_as_a_judge.utils.truncate import encode_tokens, get_encoding, truncate_tokens
+
+Section = namedtuple("Section", ["header", "body", "footer", "overhead", "priority"])
+
+
+class EvidencePiece:
+    """
+    A text tokenized once, optionally capped to `max_tokens`.
+
+    The tokens are kept so the evidence budget can cut the piece further without
+    encoding it again; the capped text is decoded only when the cap bites.
+    """
+
+    __slots__ = ("source", "tokens", "truncated", "_encoding", "_text")
+
+    def __init__(self, encoding, text: str, max_tokens: int = None, drop_mode="middle"):
+        self.source = text
+        self._encoding = encoding
+        self.tokens = encode_tokens(text)
+        self.truncated = max_tokens is not None and len(self.tokens) > max_tokens
+        if self.truncated:
+            self.tokens = truncate_tokens(
+                self.tokens, max_tokens, encode_tokens("..."), drop_mode=drop_mode
+            )
+        self._text = None
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            self._text = (
+                self._encoding.decode(self.tokens) if self.truncated else self.source
+            )
+        return self._text
+
+    def __len__(self) -> int:
+        return len(self.tokens)
+
+
+class EvidenceBuilder:
+    """
+    Assemble the judge prompt evidence under a global token budget.
+
+    Sections are added in prompt order with a priority. `build` hands the budget
+    to higher priorities first and splits it evenly within one priority, so a
+    long file no longer starves the ones after it. Each body is tokenized once
+    when added; only the sections that end up cut are decoded again.
+    """
+
+    MIN_BODY_TOKENS = 16
+
+    def __init__(self, max_tokens: int = 10000):
+        self.max_tokens = max_tokens
+        self.encoding = get_encoding()
+        self.ellipsis = encode_tokens("...")
+        self.sections: List[Section] = []
+
+    def piece(self, text, max_tokens: int = None, drop_mode="middle") -> EvidencePiece:
+        if text is None:
+            logging.warning("Received None evidence. Using an empty string.")
+            text = ""
+        return EvidencePiece(self.encoding, str(text), max_tokens, drop_mode)
+
+    def add(
+        self,
+        body: Union[str, EvidencePiece],
+        header: str = "",
+        footer: str = "",
+        priority: int = 0,
+        max_tokens: int = None,
+    ) -> str:
+        """Queue a section and return its text, capped to `max_tokens`, e.g. for logging."""
+
+        if not isinstance(body, EvidencePiece):
+            body = self.piece(body, max_tokens)
+        overhead = len(encode_tokens(header + footer))
+        self.sections.append(Section(header, body, footer, overhead, priority))
+        return header + body.text + footer
+
+    def build(self) -> str:
+
+        grants = self._allocate()
+        parts = []
+        for section, grant in zip(self.sections, grants):
+            body_budget = grant - section.overhead
+            if body_budget >= len(section.body):
+                parts.append(section.header + section.body.text + section.footer)
+            elif body_budget >= self.MIN_BODY_TOKENS:
+                body = self.encoding.decode(
+                    truncate_tokens(section.body.tokens, body_budget, self.ellipsis)
+                )
+                parts.append(section.header + body + section.footer)
+            else:
+                logging.info(f"Evidence budget exhausted, dropping: {section.header.strip()}")
+        return "".join(parts)
+
+    def _allocate(self) -> List[int]:
+        """Token grant per section: by priority, then water-filled within a priority."""
+
+        grants = [0] * len(self.sections)
+        remaining = self.max_tokens
+        for priority in sorted({s.priority for s in self.sections}, reverse=True):
+            level = sorted(
+                (
+                    (s.overhead + len(s.body), i)
+                    for i, s in enumerate(self.sections)
+                    if s.priority == priority
+                ),
+            )
+            for k, (need, i) in enumerate(level):
+                grants[i] = min(need, remaining // (len(level) - k))
+                remaining -= grants[i]
+        return grants
@@ -0,0 +1,35 @@
+from typing import List
+
+import numpy as np
+from rapidfuzz import fuzz, process
+
+
+def fuzzy_top_k(
+    query: str, fields: List[List[str]], threshold: int = 70, top_k: int = None
+) -> List[int]:
+    """
+    Indices of the entries whose best `partial_ratio` over `fields` reaches `threshold`.
+
+    `fields` holds one list of lowercased strings per field, aligned by entry.
+    Scores are computed with `process.cdist` on all cores. Matches come back in
+    entry order, or, with `top_k`, the `top_k` best ones ranked by score.
+    """
+    query = query.lower()
+    best = None
+    for choices in fields:
+        scores = process.cdist(
+            [query],
+            choices,
+            scorer=fuzz.partial_ratio,
+            score_cutoff=threshold,
+            dtype=np.uint8,
+            workers=-1,
+        )[0]
+        best = scores if best is None else np.maximum(best, scores)
+
+    if best is None:
+        return []
+    matches = np.flatnonzero(best >= threshold)
+    if top_k is not None:
+        matches = matches[np.argsort(-best[matches], kind="stable")[:top_k]]
+    return matches.tolist()
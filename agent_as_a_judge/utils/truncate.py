@@ -1,11 +1,84 @@
 import os
+import hashlib
 import logging
-from typing import Union
+import threading
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Iterable, List, Sequence, Union
 import tiktoken
 from dotenv import load_dotenv
 
 load_dotenv()
 
+ENCODING_NAME = "cl100k_base"
+
+
+@lru_cache(maxsize=None)
+def get_encoding(encoding_name: str = ENCODING_NAME) -> tiktoken.Encoding:
+    return tiktoken.get_encoding(encoding_name)
+
+
+# Token memo keyed by a digest of the text. Tokens are stored as 4-byte arrays
+# and the memo is bounded by entries and by total tokens; texts above
+# TOKEN_CACHE_MAX_TEXT_TOKENS, e.g. whole files, are encoded but not kept
+_token_cache = OrderedDict()
+_token_cache_lock = threading.Lock()
+_token_cache_tokens = 0
+TOKEN_CACHE_SIZE = 4096
+TOKEN_CACHE_MAX_TOKENS = 2_000_000
+TOKEN_CACHE_MAX_TEXT_TOKENS = 50_000
+# Characters encoded per kept token at each end of a long text; tokens rarely span more
+WINDOW_CHARS_PER_TOKEN = 8
+
+
+def _content_key(text: str) -> bytes:
+    return hashlib.blake2b(text.encode("utf-8"), digest_size=16).digest()
+
+
+def _cache_get(key: bytes):
+    with _token_cache_lock:
+        tokens = _token_cache.get(key)
+        if tokens is not None:
+            _token_cache.move_to_end(key)
+    return None if tokens is None else tuple(tokens)
+
+
+def _cache_put(key: bytes, tokens: tuple):
+    global _token_cache_tokens
+    if len(tokens) > TOKEN_CACHE_MAX_TEXT_TOKENS:
+        return
+    with _token_cache_lock:
+        if key in _token_cache:
+            return
+        _token_cache[key] = array("I", tokens)
+        _token_cache_tokens += len(tokens)
+        while (
+            len(_token_cache) > TOKEN_CACHE_SIZE
+            or _token_cache_tokens > TOKEN_CACHE_MAX_TOKENS
+        ):
+            _token_cache_tokens -= len(_token_cache.popitem(last=False)[1])
+
+
+def encode_tokens(text: str) -> tuple:
+    """Tokens of `text`, memoised by content hash so repeated texts are encoded once."""
+    key = _content_key(text)
+    tokens = _cache_get(key)
+    if tokens is None:
+        tokens = tuple(get_encoding().encode(text, disallowed_special=()))
+        _cache_put(key, tokens)
+    return tokens
+
+
+def fits_tokens(text: str, max_tokens: int) -> bool:
+    """
+    Cheap sufficient check that `text` has at most `max_tokens` tokens.
+
+    Every token covers at least one UTF-8 byte, so a string no longer than
+    `max_tokens` bytes cannot exceed it and need not be tokenized at all.
+    """
+    return len(text) <= max_tokens // 4 or len(text.encode("utf-8")) <= max_tokens
+
 
 def truncate_string(
     info_string: Union[str, None],
@@ -20,28 +93,100 @@ def truncate_string(
         )
         return ""
 
-    info_string = str(info_string)
-    encoding = tiktoken.get_encoding("cl100k_base")
-    tokens = encoding.encode(info_string, disallowed_special=())
+    return _truncate(str(info_string), max_tokens, drop_mode, encode_tokens("..."))
+
+
+def truncate_strings(
+    info_strings: Iterable[Union[str, None]],
+    max_tokens: int = 10000,
+    drop_mode="middle",
+) -> List[str]:
+    """`truncate_string` for many strings at once, e.g. one field of every trajectory step."""
+
+    ellipsis = encode_tokens("...")
+    return [
+        "" if s is None else _truncate(str(s), max_tokens, drop_mode, ellipsis)
+        for s in info_strings
+    ]
+
+
+def _truncate(text: str, max_tokens: int, drop_mode: str, ellipsis: tuple) -> str:
 
+    if fits_tokens(text, max_tokens):
+        return text
+
+    # Only the kept head and tail matter, so a long text is first tried from its two ends
+    window = WINDOW_CHARS_PER_TOKEN * (max_tokens + 1)
+    if len(text) > 2 * window:
+        truncated = truncate_windows(text[:window], text[-window:], max_tokens, drop_mode)
+        if truncated is not None:
+            return truncated
+
+    tokens = encode_tokens(text)
     # If tokens exceed the maximum length, we truncate based on the drop_mode
-    if len(tokens) > max_tokens:
-        # logging.warning(f"Input string exceeds maximum token limit ({max_tokens}). Truncating using {drop_mode} mode.")
-        ellipsis = encoding.encode("...")
-        ellipsis_len = len(ellipsis)
-
-        if drop_mode == "head":
-            tokens = ellipsis + tokens[-(max_tokens - ellipsis_len) :]
-        elif drop_mode == "middle":
-            head_tokens = (max_tokens - ellipsis_len) // 2
-            tail_tokens = max_tokens - head_tokens - ellipsis_len
-            tokens = tokens[:head_tokens] + ellipsis + tokens[-tail_tokens:]
-        elif drop_mode == "tail":
-            tokens = tokens[: (max_tokens - ellipsis_len)] + ellipsis
-
-        else:
-            raise ValueError(
-                f"Unknown drop_mode: {drop_mode}. Supported modes: 'head', 'middle', 'tail'."
-            )
-
-    return encoding.decode(tokens)
+    if len(tokens) <= max_tokens:
+        return text
+    # logging.warning(f"Input string exceeds maximum token limit ({max_tokens}). Truncating using {drop_mode} mode.")
+    return get_encoding().decode(
+        truncate_tokens(tokens, max_tokens, ellipsis, drop_mode=drop_mode)
+    )
+
+
+def truncate_windows(
+    head: str, tail: str, max_tokens: int = 10000, drop_mode="middle"
+) -> Union[str, None]:
+    """
+    `truncate_string` of a long text given only its first and last characters.
+
+    `head` and `tail` are disjoint windows at the two ends of the text. The last
+    head token and the first tail token may straddle the window edge and are not
+    used. Returns None when the windows hold too few tokens to decide, and the
+    caller should fall back to the whole text.
+    """
+    ellipsis = encode_tokens("...")
+    keep = max_tokens - len(ellipsis)
+    if drop_mode == "head":
+        head_tokens, tail_tokens = 0, keep
+    elif drop_mode == "middle":
+        head_tokens = keep // 2
+        tail_tokens = keep - head_tokens
+    elif drop_mode == "tail":
+        head_tokens, tail_tokens = keep, 0
+    else:
+        raise ValueError(
+            f"Unknown drop_mode: {drop_mode}. Supported modes: 'head', 'middle', 'tail'."
+        )
+
+    encoding = get_encoding()
+    head = encoding.encode(head, disallowed_special=())[:-1]
+    tail = encoding.encode(tail, disallowed_special=())[1:]
+    # More tokens in the windows alone than the limit means the text is over it
+    if len(head) + len(tail) <= max_tokens or len(head) < head_tokens or len(tail) < tail_tokens:
+        return None
+    return encoding.decode(
+        [*head[:head_tokens], *ellipsis, *tail[len(tail) - tail_tokens :]]
+    )
+
+
+def truncate_tokens(
+    tokens: Sequence[int], max_tokens: int, ellipsis: Sequence[int], drop_mode="middle"
+) -> List[int]:
+    """Cut `tokens` to `max_tokens`, marking the dropped part with `ellipsis`."""
+
+    if len(tokens) <= max_tokens:
+        return list(tokens)
+    ellipsis_len = len(ellipsis)
+
+    if drop_mode == "head":
+        return [*ellipsis, *tokens[-(max_tokens - ellipsis_len) :]]
+    elif drop_mode == "middle":
+        head_tokens = (max_tokens - ellipsis_len) // 2
+        tail_tokens = max_tokens - head_tokens - ellipsis_len
+        return [*tokens[:head_tokens], *ellipsis, *tokens[-tail_tokens:]]
+    elif drop_mode == "tail":
+        return [*tokens[: (max_tokens - ellipsis_len)], *ellipsis]
+
+    else:
+        raise ValueError(
+            f"Unknown drop_mode: {drop_mode}. Supported modes: 'head', 'middle', 'tail'."
+        )
@@ -1,6 +1,7 @@
 import time
 import traceback
 
+from dotenv import load_dotenv
 from loguru import logger
 
 from bot.sql_processor import get_task_by_status, update_task_result_by_id, update_task_status_by_id
@@ -8,6 +9,7 @@ from bot.task_statuses import TaskStatuses
 from bot.settings import settings
 
 from scripts.run import main
+from agent_as_a_judge.llm.embedding import EmbeddingService
 
 def get_task() -> str | None:
     task = get_task_by_status(TaskStatuses.READY_FOR_PROCESSING)
@@ -32,6 +34,15 @@ def mock_work_for_task(path_to_project: str) -> str:
     return str(output_path)
 
 
+def warm_up_embeddings() -> None:
+    # The service is process-wide, so the model stays loaded across tasks
+    load_dotenv()
+    try:
+        EmbeddingService.get().warm_up()
+    except Exception as e:
+        logger.warning(f"Embedding model warm-up failed, it will be loaded on first search. Error: {e}")
+
+
 def worker():
     while True:
         task_id = get_task()
@@ -54,4 +65,6 @@ def worker():
             time.sleep(10)
 
 
-worker()
+if __name__ == "__main__":
+    warm_up_embeddings()
+    worker()
@@ -0,0 +1,86 @@
+import time
+import random
+import argparse
+import networkx as nx
+
+from agent_as_a_judge.module.graph import DevGraph, Tag
+
+
+def make_tags(n_tags: int, def_ratio: float = 0.1, seed: int = 0) -> list:
+    """Synthetic tag set: a pool of names, ~def_ratio of tags are definitions."""
+    rng = random.Random(seed)
+    n_names = max(1, n_tags // 20)
+    tags = []
+    for i in range(n_tags):
+        name = f"name_{rng.randrange(n_names)}"
+        identifier = "def" if rng.random() < def_ratio else "ref"
+        tags.append(
+            Tag(
+                rel_fname=f"src/file_{i % 500}.py",
+                fname=f"/workspace/src/file_{i % 500}.py",
+                line=[i, i + 1],
+                name=name,
+                identifier=identifier,
+                category="function",
+                details=f"{name}()",
+            )
+        )
+    return tags
+
+
+def legacy_reference_edges(G, tags):
+    """The previous O(refs x defs) implementation, kept for comparison."""
+    tags_ref = [tag for tag in tags if tag.identifier == "ref"]
+    tags_def = [tag for tag in tags if tag.identifier == "def"]
+    for tag_ref in tags_ref:
+        for tag_def in tags_def:
+            if tag_ref.name == tag_def.name:
+                G.add_edge(tag_ref.name, tag_def.name)
+
+
+def timed(func, *args):
+    start = time.perf_counter()
+    func(*args)
+    return time.perf_counter() - start
+
+
+def main(sizes, legacy_limit):
+    dev_graph = DevGraph()
+    print(f"{'tags':>8} {'indexed, s':>12} {'legacy, s':>12} {'edges':>8} {'weight':>10}")
+    for n_tags in sizes:
+        tags = make_tags(n_tags)
+
+        G = nx.MultiDiGraph()
+        indexed = timed(dev_graph._add_reference_edges, G, tags)
+        total_weight = sum(w for _, _, w in G.edges(data="weight"))
+
+        legacy = "-"
+        if n_tags <= legacy_limit:
+            G_legacy = nx.MultiDiGraph()
+            legacy = f"{timed(legacy_reference_edges, G_legacy, tags):.4f}"
+            assert G_legacy.number_of_edges() == total_weight
+
+        print(
+            f"{n_tags:>8} {indexed:>12.4f} {legacy:>12} {G.number_of_edges():>8} {total_weight:>10}"
+        )
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Micro-benchmark of DevGraph reference edge construction"
+    )
+    parser.add_argument(
+        "--sizes", nargs="+", type=int, default=[1000, 10000, 100000]
+    )
+    parser.add_argument(
+        "--legacy_limit",
+        type=int,
+        default=10000,
+        help="Largest tag set also timed with the quadratic implementation",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    main(args.sizes, args.legacy_limit)
@@ -0,0 +1,60 @@
+import time
+import logging
+import argparse
+import resource
+import tracemalloc
+from copy import deepcopy
+
+from agent_as_a_judge.module.graph import DevGraph
+
+
+def legacy_navigate_structure(self, relative_filepath_list):
+    """The previous lookup, which copied the whole project structure per file."""
+    s = deepcopy(self.structure)
+    for fname_part in relative_filepath_list:
+        s = s.get(fname_part)
+        if s is None:
+            return None
+    return s
+
+
+def main(workspace, legacy):
+    if legacy:
+        DevGraph._navigate_structure = legacy_navigate_structure
+
+    dev_graph = DevGraph(root=workspace, max_workers=1)
+    filepaths = dev_graph.list_code_files([workspace])
+    dev_graph.structure
+
+    # Tag every file through the structure lookup path, as get_tags does without a parse artifact
+    tracemalloc.start()
+    start = time.perf_counter()
+    n_tags = sum(len(dev_graph._process_file(filepath)) for filepath in filepaths)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    max_rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(
+        f"files={len(filepaths)} tags={n_tags} legacy={legacy} "
+        f"time={elapsed:.2f}s traced_peak={peak / 2**20:.1f}MB max_rss={max_rss / 2**10:.1f}MB"
+    )
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Measure time and memory of per-file tagging in DevGraph"
+    )
+    parser.add_argument("--workspace", type=str, required=True)
+    parser.add_argument(
+        "--legacy_navigate",
+        action="store_true",
+        help="Use the old deepcopy-based structure lookup for comparison",
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    logging.disable(logging.INFO)
+    args = parse_arguments()
+    main(args.workspace, args.legacy_navigate)
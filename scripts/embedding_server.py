@@ -0,0 +1,84 @@
+import os
+import json
+import logging
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from rich.logging import RichHandler
+
+from agent_as_a_judge.llm.embedding import EmbeddingService, DEFAULT_EMBEDDING_MODEL
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s - %(levelname)s - %(message)s",
+    handlers=[RichHandler()],
+)
+
+
+def make_handler(service: EmbeddingService):
+
+    class EmbeddingHandler(BaseHTTPRequestHandler):
+
+        def _send_json(self, status: int, payload: dict):
+            body = json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def do_GET(self):
+            if self.path == "/info":
+                self._send_json(200, {"model": service.model_name})
+            else:
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+
+        def do_POST(self):
+            if self.path != "/encode":
+                self._send_json(404, {"error": f"Unknown path: {self.path}"})
+                return
+            try:
+                length = int(self.headers.get("Content-Length", 0))
+                texts = json.loads(self.rfile.read(length).decode("utf-8"))["texts"]
+                embeddings = service.encode(list(texts))
+            except Exception as e:
+                logging.error(f"Failed to encode request: {e}")
+                self._send_json(400, {"error": str(e)})
+                return
+            self._send_json(200, {"embeddings": embeddings.tolist()})
+
+        def log_message(self, format, *args):
+            logging.debug(format % args)
+
+    return EmbeddingHandler
+
+
+def main(host: str, port: int, model: str):
+    # The server always runs the model itself, whatever EMBEDDING_SERVICE_URL says
+    service = EmbeddingService(model_name=model)
+    service.warm_up()
+    server = ThreadingHTTPServer((host, port), make_handler(service))
+    logging.info(f"Embedding server for {model} listening on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Serve sentence embeddings to several judge workers over local HTTP"
+    )
+    parser.add_argument("--host", type=str, default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=30001)
+    parser.add_argument(
+        "--model", type=str, default=os.getenv("EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+    )
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_arguments()
+    main(args.host, args.port, args.model)
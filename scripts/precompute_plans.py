@@ -0,0 +1,56 @@
+import json
+import argparse
+import logging
+from pathlib import Path
+from dotenv import load_dotenv
+
+from agent_as_a_judge.module.planning import PlanStore
+
+
+def main(instance_dir: Path, force: bool, logger: logging.Logger):
+
+    instance_files = sorted(instance_dir.glob("*.json"))
+    logger.info(f"Total instances found: {len(instance_files)}")
+
+    for instance_file in instance_files:
+        with open(instance_file, "r", encoding="utf-8") as f:
+            requirements = json.load(f).get("requirements", [])
+
+        plan_store = PlanStore(instance_file)
+        generated = plan_store.precompute(
+            [requirement["criteria"] for requirement in requirements], force=force
+        )
+        logger.info(
+            f"{instance_file.name}: planned {generated} of {len(requirements)} criteria, "
+            f"saved to {plan_store.plans_file}"
+        )
+
+
+def parse_arguments():
+    parser = argparse.ArgumentParser(
+        description="Precompute the per-criterion plans of every instance file"
+    )
+
+    parser.add_argument(
+        "--instance_dir",
+        type=str,
+        default="benchmark/devai/instances",
+        help="Directory with the instance JSON files",
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-plan criteria that already have a stored plan",
+    )
+
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    load_dotenv()
+
+    logger = logging.getLogger(__name__)
+    logging.basicConfig(level=logging.INFO)
+    args = parse_arguments()
+
+    main(instance_dir=Path(args.instance_dir), force=args.force, logger=logger)
@@ -109,6 +109,8 @@ def main(input_path):
         workspace_dir=workspace_dir,
         instance_dir=instance_dir,
         trajectory_file=None,
+        max_concurrency=int(os.getenv("JUDGE_MAX_CONCURRENCY", 1)),
+        cache_dir=benchmark_dir / "cache",
     )
 
    
@@ -164,6 +164,17 @@ def parse_arguments():
         type=str,
         help="Path to the trajectory directory, if available",
     )
+    parser.add_argument(
+        "--max_concurrency",
+        type=int,
+        default=1,
+        help="Number of requirements checked concurrently",
+    )
+    parser.add_argument(
+        "--cache_dir",
+        type=str,
+        help="Directory for caches reused across runs, e.g. parsed files of the code graph",
+    )
 
     return parser.parse_args()
 
@@ -194,6 +205,8 @@ if __name__ == "__main__":
         workspace_dir=workspace_dir,
         instance_dir=instance_dir,
         trajectory_file=trajectory_file,
+        max_concurrency=args.max_concurrency,
+        cache_dir=Path(args.cache_dir) if args.cache_dir else None,
     )
 
     main(